@@ -0,0 +1,159 @@
+# CallbackStormBenchmark.py v1.1
+#
+# Replays knob-change storms against the NodeGraph callbacks (NodeLabeler, CryptoLabeler,
+# AdvancedShuffle, CryptoMatteFixer, InferenceNodeCallback) on a synthetic script built
+# with FakeNuke, and reports per scenario how many callback events fired, events per
+# second and the total time spent in the handlers (measured with CallbackProfiler) and in
+# the BulkRefresh updaters of the script load pass.
+# A regression in any NodeGraph callback shows up as a lower events/s or higher handler time.
+#
+# Scenarios:
+#   script_load  - create the script's nodes (onCreate) and run onScriptLoad (BulkRefresh pass)
+#   slider_drag  - drag a slider on --drag-nodes nodes, --drag-steps value changes each
+#   move         - move every node --moves times (xpos/ypos changes)
+#   paste        - paste --paste new nodes into the script
+#
+# Usage:
+#   python Benchmarks/CallbackStormBenchmark.py --nodes 5000
+#   python Benchmarks/CallbackStormBenchmark.py --nodes 20000 slider_drag move
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+for folder in ("NodeGraph", "CopyCat", ""):
+    sys.path.insert(0, os.path.join(REPO_DIR, folder))
+
+import FakeNuke
+nuke = FakeNuke.install()
+
+CALLBACK_TOOLS = ["NodeLabeler", "CryptoLabeler", "AdvancedShuffle", "CryptoMatteFixer", "InferenceNodeCallback"]
+# (node class, share of the script, knob dragged in slider_drag, knob values at creation)
+NODE_MIX = [
+    ("Grade", 0.35, "white", {}),
+    ("Merge2", 0.2, "mix", {}),
+    ("Blur", 0.2, "size", {}),
+    ("Dot", 0.1, None, {}),
+    ("Shuffle2", 0.08, "in1", {"in1": "rgba"}),
+    ("Cryptomatte", 0.05, "matteList", {"cryptoLayer": "cryptomatte_obj", "expression": "", "matteList": ""}),
+    ("Inference", 0.02, "modelFile", {"modelFile": "/models/SQ0010_2210_v1.cat"}),
+]
+
+with contextlib.redirect_stdout(io.StringIO()):
+    for module_name in CALLBACK_TOOLS:
+        __import__(module_name)
+import CallbackProfiler
+import BulkRefresh
+
+def drag_value(knob_name, step):
+    if knob_name == "in1":
+        return "rgba" if step % 2 else "diffuse.red"
+    if knob_name == "matteList":
+        return f"object{step}"
+    if knob_name == "modelFile":
+        return f"/models/SQ0010_2210_v{step % 5 + 1}.cat"
+    return 1.0 + step * 0.01
+
+def create_nodes(count, start_index=0):
+    """Create count nodes in the NODE_MIX proportions, laid out in a grid."""
+    created = []
+    for node_class, share, _, knob_values in NODE_MIX:
+        for i in range(max(1, int(count * share))):
+            index = start_index + len(created)
+            created.append(getattr(nuke.nodes, node_class)(xpos=(index % 100) * 110, ypos=(index // 100) * 60, **knob_values))
+            if node_class == "Grade" and i % 10 == 0:
+                created[-1]["white"].setValueAt(1.2, 1001)
+    return created
+
+def scenario_script_load(args):
+    FakeNuke.reset()
+    create_nodes(args.nodes)
+    FakeNuke.load_script()
+
+def scenario_slider_drag(args):
+    for node_class, _, knob_name, _ in NODE_MIX:
+        if knob_name is None:
+            continue
+        for node in nuke.allNodes(node_class)[:args.drag_nodes]:
+            for step in range(args.drag_steps):
+                node[knob_name].setValue(drag_value(knob_name, step))
+
+def scenario_move(args):
+    nodes = nuke.allNodes()
+    for move in range(1, args.moves + 1):
+        for node in nodes:
+            node.setXYpos(node.xpos() + 10, node.ypos() + move % 2)
+
+def scenario_paste(args):
+    create_nodes(args.paste, start_index=len(nuke.allNodes()))
+
+SCENARIOS = [
+    ("script_load", scenario_script_load),
+    ("slider_drag", scenario_slider_drag),
+    ("move", scenario_move),
+    ("paste", scenario_paste),
+]
+
+def count_events():
+    counts = FakeNuke.call_counts()
+    return sum(count for name, count in counts.items() if name.startswith("callback.") and name != "callback.depth_exceeded")
+
+def updater_timings(refresh):
+    """The BulkRefresh pass's time per updater, in the shape of CallbackProfiler's handler entries."""
+    if refresh is None:
+        return {}
+    return {f"BulkRefresh.{name}": {"calls": count, "seconds": seconds, "p99_ms": None}
+            for name, (seconds, count) in refresh.timings.items()}
+
+def run_scenario(name, scenario, args):
+    # Scenarios after script_load reuse its script; the first one builds it if skipped
+    if name != "script_load" and not nuke.allNodes():
+        with contextlib.redirect_stdout(io.StringIO()):
+            scenario_script_load(args)
+    FakeNuke.reset(nodes=False)
+    BulkRefresh.last_refresh = None
+    CallbackProfiler.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        scenario(args)
+        elapsed = time.perf_counter() - start
+    handlers = CallbackProfiler.report()["handlers"]
+    CallbackProfiler.stop()
+    handlers.update(updater_timings(BulkRefresh.last_refresh))
+    handlers = dict(sorted(handlers.items(), key=lambda item: -item[1]["seconds"]))
+
+    events = count_events()
+    handler_seconds = sum(entry["seconds"] for entry in handlers.values())
+    print(f"{name:<12} {events:8d} events  {elapsed * 1000:9.1f} ms  {events / elapsed if elapsed else 0:10.0f} events/s"
+          f"  handlers {handler_seconds * 1000:8.1f} ms")
+    for handler, entry in list(handlers.items())[:args.top]:
+        p99 = f"p99 {entry['p99_ms']:.3f} ms" if entry["p99_ms"] is not None else ""
+        print(f"    {handler:<45} {entry['calls']:7d} calls  {entry['seconds'] * 1000:8.1f} ms  {p99}")
+    return {"events": events, "seconds": elapsed, "handler_seconds": handler_seconds, "handlers": handlers}
+
+def run_benchmark(args, only=None):
+    # Handler time covers the dispatcher's handlers and, in script_load, the BulkRefresh updaters
+    results = {}
+    for name, scenario in SCENARIOS:
+        if only and name not in only:
+            continue
+        results[name] = run_scenario(name, scenario, args)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay knob-change storms against the NodeGraph callbacks.")
+    parser.add_argument("--nodes", type=int, default=5000, help="Nodes in the synthetic script")
+    parser.add_argument("--drag-nodes", type=int, default=20, help="Nodes per class whose slider is dragged")
+    parser.add_argument("--drag-steps", type=int, default=60, help="Value changes per slider drag")
+    parser.add_argument("--moves", type=int, default=5, help="Times every node is moved")
+    parser.add_argument("--paste", type=int, default=500, help="Nodes pasted")
+    parser.add_argument("--top", type=int, default=5, help="Handlers listed per scenario")
+    parser.add_argument("scenarios", nargs="*", help="Only run these scenarios")
+    args = parser.parse_args()
+    run_benchmark(args, args.scenarios)
@@ -0,0 +1,710 @@
+# FakeNuke.py v2.0
+#
+# Headless in-process stand-in for the nuke module, so the tools in this repository can
+# be imported, run and profiled outside Nuke (e.g. in CI). It is deliberately not called
+# nuke.py and does not live on the plugin path: call install() to register it as
+# sys.modules['nuke'].
+#
+# Covers what the tools use: nuke.nodes.<Class>(), createNode, knobs (value, expressions,
+# animation, flags), xpos/ypos, inputs and dependents, allNodes/selectedNodes/toNode,
+# callbacks (onCreate, onUserCreate, knobChanged, onScriptLoad), menus and Undo.
+# Every knob write fires knobChanged like Nuke does (also when the value is unchanged),
+# with thisNode()/thisKnob() set.
+#
+# Every public API call is recorded, so node-creation counts and API call volume become
+# measurable numbers:
+#   import FakeNuke
+#   nuke = FakeNuke.install()
+#   FakeNuke.reset()
+#   ...run a tool...
+#   FakeNuke.call_counts()       # {'nodes.Dot': 4, 'Knob.setValue': 12, 'Node.setXYpos': 10, ...}
+#   FakeNuke.created_nodes()     # {'Dot': 4, 'Shuffle2': 3, ...}
+
+import sys
+from collections import Counter
+
+# User variables
+RECORD_ARGUMENTS = False  # Also keep (name, args) of every call in call_log(); memory heavy on big runs
+FIRE_KNOB_CHANGED = True  # Run knobChanged callbacks when a knob is written
+MAX_CALLBACK_DEPTH = 16  # Nested callbacks deeper than this are dropped (and counted) instead of recursing forever
+STRICT_KNOBS = False  # Raise NameError for knobs the fake does not model, instead of creating them on first access
+NODE_WIDTH = 80  # screenWidth()/screenHeight() of ordinary nodes
+NODE_HEIGHT = 18
+
+GUI = False
+INPUTS = 0x1
+HIDDEN_INPUTS = 0x2
+EXPRESSIONS = 0x4
+ALL = INPUTS | HIDDEN_INPUTS | EXPRESSIONS
+STARTLINE = 0x1000
+INVISIBLE = 0x400
+DISABLED = 0x80
+NO_ANIMATION = 0x100
+
+_calls = Counter()
+_call_log = []
+_created = Counter()
+_callbacks = {'onCreate': [], 'onUserCreate': [], 'onDestroy': [], 'knobChanged': [], 'onScriptLoad': []}
+_context = []  # stack of (node, knob) for thisNode()/thisKnob()
+
+# Recording ----------------------------------------------------------------
+
+def record(name, *args):
+    _calls[name] += 1
+    if RECORD_ARGUMENTS:
+        _call_log.append((name, args))
+
+def reset(nodes=True, callbacks=False):
+    """Clear recorded calls (and the node graph / registered callbacks if asked)."""
+    _calls.clear()
+    del _call_log[:]
+    _created.clear()
+    del Undo.groups[:]
+    Undo._depth = 0
+    if nodes:
+        _root_node._children = []
+        _root_node._names = Counter()
+    if callbacks:
+        for registered in _callbacks.values():
+            del registered[:]
+
+def call_counts():
+    return dict(_calls)
+
+def call_log():
+    return list(_call_log)
+
+def created_nodes():
+    return dict(_created)
+
+def total_calls():
+    return sum(_calls.values())
+
+# Knobs --------------------------------------------------------------------
+
+class Knob(object):
+    def __init__(self, name, label=None, value=None):
+        self._name = name
+        self._label = label or name
+        self._value = value
+        self._expression = None
+        self._keys = {}
+        self._flags = 0
+        self._node = None
+
+    def name(self):
+        record('Knob.name')
+        return self._name
+
+    def label(self):
+        return self._label
+
+    def node(self):
+        return self._node
+
+    def Class(self):
+        return type(self).__name__
+
+    def value(self, *args):
+        record('Knob.value')
+        return self._value
+
+    def getValue(self, *args):
+        record('Knob.getValue')
+        return self._value
+
+    def setValue(self, value, *args):
+        record('Knob.setValue', self._name, value)
+        self._value = value
+        _knob_changed(self)  # Like Nuke, also when the value does not change
+        return True
+
+    def setValueAt(self, value, frame, *args):
+        record('Knob.setValueAt', self._name, value, frame)
+        self._keys[frame] = value
+        _knob_changed(self)
+        return True
+
+    def setAnimated(self, *args):
+        record('Knob.setAnimated')
+        if not self._keys:
+            self._keys[0] = self._value
+        _knob_changed(self)
+        return True
+
+    def clearAnimated(self, *args):
+        record('Knob.clearAnimated')
+        self._keys.clear()
+        _knob_changed(self)
+        return True
+
+    def isAnimated(self, *args):
+        record('Knob.isAnimated')
+        return bool(self._keys) or self._expression is not None
+
+    def setExpression(self, expression, *args):
+        record('Knob.setExpression', self._name, expression)
+        self._expression = expression
+        _knob_changed(self)
+        return True
+
+    def expression(self):
+        return self._expression
+
+    def hasExpression(self, *args):
+        return self._expression is not None
+
+    def setRange(self, minimum, maximum):
+        record('Knob.setRange')
+
+    def setFlag(self, flag):
+        record('Knob.setFlag')
+        self._flags |= flag
+
+    def clearFlag(self, flag):
+        record('Knob.clearFlag')
+        self._flags &= ~flag
+
+    def getFlag(self, flag):
+        return bool(self._flags & flag)
+
+    def setVisible(self, visible):
+        record('Knob.setVisible')
+        if visible:
+            self._flags &= ~INVISIBLE
+        else:
+            self._flags |= INVISIBLE
+
+    def setEnabled(self, enabled):
+        record('Knob.setEnabled')
+
+    def setTooltip(self, tooltip):
+        record('Knob.setTooltip')
+
+    def __repr__(self):
+        return f"<{self.Class()} {self._name}>"
+
+def _knob_class(class_name, default=None):
+    def __init__(self, name, label=None, value=None, *args):
+        Knob.__init__(self, name, label, default if value is None else value)
+    return type(class_name, (Knob,), {'__init__': __init__})
+
+Tab_Knob = _knob_class('Tab_Knob')
+Text_Knob = _knob_class('Text_Knob', '')
+String_Knob = _knob_class('String_Knob', '')
+Multiline_Eval_String_Knob = _knob_class('Multiline_Eval_String_Knob', '')
+File_Knob = _knob_class('File_Knob', '')
+Int_Knob = _knob_class('Int_Knob', 0)
+Double_Knob = _knob_class('Double_Knob', 0.0)
+Boolean_Knob = _knob_class('Boolean_Knob', False)
+Enumeration_Knob = _knob_class('Enumeration_Knob', '')
+Color_Knob = _knob_class('Color_Knob', 0.0)
+XY_Knob = _knob_class('XY_Knob', [0.0, 0.0])
+PyScript_Knob = _knob_class('PyScript_Knob', '')
+
+# Knobs every node has, with their defaults
+COMMON_KNOBS = {'name': '', 'label': '', 'tile_color': 0, 'gl_color': 0, 'note_font_size': 11,
+                'selected': False, 'disable': False, 'hide_input': False, 'postage_stamp': False,
+                'xpos': 0, 'ypos': 0}
+
+# Knobs added per class so tools can read values they expect to exist
+CLASS_KNOBS = {
+    'Read': {'file': '', 'first': 1, 'last': 1, 'origfirst': 1, 'origlast': 1, 'frame': '', 'file_type': '', 'colorspace': 'default'},
+    'Write': {'file': '', 'file_type': ''},
+    'Grade': {'channels': 'rgb', 'blackpoint': 0.0, 'whitepoint': 1.0, 'black': 0.0, 'white': 1.0,
+              'multiply': 1.0, 'add': 0.0, 'gamma': 1.0, 'reverse': False, 'black_clamp': True,
+              'white_clamp': False, 'maskChannelMask': 'none', 'maskChannelInput': 'none', 'inject': False,
+              'invert_mask': False, 'fringe': False, 'unpremult': 'none', 'invert_unpremult': False,
+              'mix_luminance': 0.0, 'mix': 1.0},
+    'ColorCorrect': dict([(f"{section}{attr}", 0.0 if attr == 'offset' else 1.0)
+                          for section in ('', 'shadows.', 'midtones.', 'highlights.')
+                          for attr in ('saturation', 'contrast', 'gamma', 'gain', 'offset')], mix=1.0),
+    'BackdropNode': {'bdwidth': 0, 'bdheight': 0, 'z_order': 0},
+    'Shuffle': {'in': 'rgba', 'in2': 'none', 'red': 'red', 'green': 'green', 'blue': 'blue', 'alpha': 'alpha'},
+    'Shuffle2': {'in1': 'rgba', 'in2': 'none', 'mappings': []},
+    'ContactSheet': {'width': 0, 'height': 0, 'rows': 1, 'columns': 1, 'center': False, 'roworder': 'BottomTop'},
+}
+
+# Nodes --------------------------------------------------------------------
+
+class Node(object):
+    def __init__(self, node_class, parent=None):
+        self._class = node_class
+        self._knobs = {}
+        self._inputs = []
+        self._channels = []
+        self._parent = parent
+        self._children = []
+        self._names = Counter()
+        for name, value in COMMON_KNOBS.items():
+            self._add(Knob(name, value=value))
+        for name, value in CLASS_KNOBS.get(node_class, {}).items():
+            self._add(Knob(name, value=value))
+
+    def _add(self, knob):
+        knob._node = self
+        self._knobs[knob._name] = knob
+        return knob
+
+    def Class(self):
+        record('Node.Class')
+        return self._class
+
+    def name(self):
+        record('Node.name')
+        return self._knobs['name']._value
+
+    def fullName(self):
+        return self.name()
+
+    def setName(self, name, *args):
+        record('Node.setName', name)
+        self._knobs['name'].setValue(name)
+
+    def knob(self, name):
+        record('Node.knob', name)
+        return self._knobs.get(name)
+
+    def knobs(self):
+        record('Node.knobs')
+        return dict(self._knobs)
+
+    def __getitem__(self, name):
+        record('Node.__getitem__', name)
+        knob = self._knobs.get(name)
+        if knob is None:
+            if STRICT_KNOBS:
+                raise NameError(f"knob {name} does not exist")
+            record('Node.unknown_knob', name)
+            knob = self._add(Knob(name))
+        return knob
+
+    def __contains__(self, name):
+        return name in self._knobs
+
+    def addKnob(self, knob):
+        record('Node.addKnob', knob._name)
+        self._add(knob)
+
+    def removeKnob(self, knob):
+        record('Node.removeKnob', knob._name)
+        self._knobs.pop(knob._name, None)
+
+    def xpos(self):
+        record('Node.xpos')
+        return self._knobs['xpos']._value
+
+    def ypos(self):
+        record('Node.ypos')
+        return self._knobs['ypos']._value
+
+    def setXpos(self, x):
+        record('Node.setXpos')
+        self._knobs['xpos'].setValue(int(x))
+
+    def setYpos(self, y):
+        record('Node.setYpos')
+        self._knobs['ypos'].setValue(int(y))
+
+    def setXYpos(self, x, y):
+        record('Node.setXYpos')
+        self._knobs['xpos'].setValue(int(x))
+        self._knobs['ypos'].setValue(int(y))
+
+    def screenWidth(self):
+        record('Node.screenWidth')
+        return self._knobs['bdwidth']._value if 'bdwidth' in self._knobs else NODE_WIDTH
+
+    def screenHeight(self):
+        record('Node.screenHeight')
+        return self._knobs['bdheight']._value if 'bdheight' in self._knobs else NODE_HEIGHT
+
+    def setInput(self, index, node):
+        record('Node.setInput', index)
+        while len(self._inputs) <= index:
+            self._inputs.append(None)
+        self._inputs[index] = node
+        while self._inputs and self._inputs[-1] is None:
+            self._inputs.pop()
+        return True
+
+    def input(self, index):
+        record('Node.input', index)
+        return self._inputs[index] if index < len(self._inputs) else None
+
+    def inputs(self):
+        record('Node.inputs')
+        return len(self._inputs)
+
+    def dependencies(self, what=INPUTS | HIDDEN_INPUTS):
+        record('Node.dependencies')
+        return [node for node in dict.fromkeys(self._inputs) if node is not None]
+
+    def dependent(self, what=INPUTS | HIDDEN_INPUTS, forceEvaluate=True):
+        record('Node.dependent')
+        parent = self._parent or _root_node
+        return [node for node in parent._children if self in node._inputs]
+
+    def setSelected(self, selected):
+        record('Node.setSelected')
+        self._knobs['selected']._value = bool(selected)
+
+    def isSelected(self):
+        record('Node.isSelected')
+        return self._knobs['selected']._value
+
+    def channels(self):
+        record('Node.channels')
+        return list(self._channels)
+
+    def setChannels(self, channels):
+        """Fake-only: set what channels() returns (e.g. a multi-layer EXR Read)."""
+        self._channels = list(channels)
+
+    def begin(self):
+        _group_stack.append(self)
+        return self
+
+    def end(self):
+        if len(_group_stack) > 1:
+            _group_stack.pop()
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, *exc_info):
+        self.end()
+
+    def __repr__(self):
+        return f"<{self._class} {self._knobs['name']._value}>"
+
+class RootNode(Node):
+    def __init__(self):
+        Node.__init__(self, 'Root')
+        for name, value in {'first_frame': 1, 'last_frame': 100, 'format': 'HD_1080', 'fps': 24.0}.items():
+            self._add(Knob(name, value=value))
+        self._knobs['name']._value = 'Root'
+
+_root_node = RootNode()
+_group_stack = [_root_node]
+
+def _parent():
+    return _group_stack[-1]
+
+def _unique_name(parent, node_class):
+    parent._names[node_class] += 1
+    return f"{node_class}{parent._names[node_class]}"
+
+def _knob_changed(knob):
+    node = knob._node
+    if node is None or not FIRE_KNOB_CHANGED or not _callbacks['knobChanged']:
+        return
+    _run_callbacks('knobChanged', node, knob)
+
+def _run_callbacks(kind, node, knob=None):
+    for function, args, kwargs, node_class in list(_callbacks[kind]):
+        if node_class != '*' and node_class != node._class:
+            continue
+        if len(_context) >= MAX_CALLBACK_DEPTH:
+            record('callback.depth_exceeded')
+            return
+        record(f'callback.{kind}')
+        _context.append((node, knob))
+        try:
+            function(*args, **kwargs)
+        finally:
+            _context.pop()
+
+def _make_node(node_class, knob_values, inputs=None):
+    parent = _parent()
+    node = Node(node_class, parent)
+    node._knobs['name']._value = _unique_name(parent, node_class)
+    parent._children.append(node)
+    _created[node_class] += 1
+    for index, input_node in enumerate(inputs or []):
+        node.setInput(index, input_node)
+    for name, value in knob_values.items():
+        knob = node._knobs.get(name) or node._add(Knob(name))
+        knob._value = value
+    _run_callbacks('onCreate', node)
+    return node
+
+class _NodeFactory(object):
+    """nuke.nodes: nuke.nodes.Blur(size=10, inputs=[read]) creates a Blur without selecting or connecting it."""
+
+    def __getattr__(self, node_class):
+        if node_class.startswith('_'):
+            raise AttributeError(node_class)
+
+        def create(**knob_values):
+            record(f'nodes.{node_class}')
+            inputs = knob_values.pop('inputs', None)
+            return _make_node(node_class, knob_values, inputs)
+        return create
+
+nodes = _NodeFactory()
+
+def createNode(node_class, knobs="", inpanel=True):
+    """Create a node like the user would: connected to and placed below the selected node, then selected."""
+    record('createNode', node_class)
+    selected = selectedNodes()
+    node = _make_node(node_class, {}, selected[:1])
+    if selected:
+        node._knobs['xpos']._value = selected[0]._knobs['xpos']._value
+        node._knobs['ypos']._value = selected[0]._knobs['ypos']._value + NODE_HEIGHT * 3
+    for other in _parent()._children:
+        other._knobs['selected']._value = other is node
+    _run_callbacks('onUserCreate', node)
+    return node
+
+def delete(node):
+    record('delete')
+    _run_callbacks('onDestroy', node)
+    parent = node._parent or _root_node
+    if node in parent._children:
+        parent._children.remove(node)
+    for other in parent._children:
+        other._inputs = [None if input_node is node else input_node for input_node in other._inputs]
+
+def allNodes(filter=None, group=None, recurseGroups=False):
+    record('allNodes')
+    children = (group or _parent())._children
+    return [node for node in children if filter is None or node._class == filter]
+
+def selectedNodes(filter=None):
+    record('selectedNodes')
+    return [node for node in _parent()._children
+            if node._knobs['selected']._value and (filter is None or node._class == filter)]
+
+def selectedNode():
+    record('selectedNode')
+    selected = [node for node in _parent()._children if node._knobs['selected']._value]
+    if not selected:
+        raise ValueError("no node selected")
+    return selected[-1]
+
+def toNode(name):
+    record('toNode')
+    if name == 'root':
+        return _root_node
+    for node in _parent()._children:
+        if node._knobs['name']._value == name:
+            return node
+    return None
+
+def exists(name):
+    record('exists')
+    return toNode(name) is not None
+
+def root():
+    record('root')
+    return _root_node
+
+def Root():
+    """nuke.Root(): the root node, usable as 'with nuke.Root():'."""
+    record('Root')
+    return _root_node
+
+def thisNode():
+    record('thisNode')
+    return _context[-1][0] if _context else _root_node
+
+def thisKnob():
+    record('thisKnob')
+    return _context[-1][1] if _context else None
+
+def set_script_name(name):
+    """Fake-only: set what nuke.root().name() returns."""
+    _root_node._knobs['name']._value = name
+
+def load_script():
+    """Fake-only: run the onScriptLoad callbacks as if a script had just been opened."""
+    _run_callbacks('onScriptLoad', _root_node)
+
+def defaultNodeColor(node_class):
+    record('defaultNodeColor')
+    return 0x7f7f7fff
+
+def zoom(*args):
+    record('zoom')
+    return 1.0
+
+def center():
+    record('center')
+    return [0.0, 0.0]
+
+# Callbacks ----------------------------------------------------------------
+
+def _add_callback(kind, function, args=(), kwargs={}, nodeClass='*'):
+    record(f'add.{kind}')
+    entry = (function, tuple(args) if isinstance(args, (list, tuple)) else (args,), dict(kwargs), nodeClass)
+    if entry not in _callbacks[kind]:
+        _callbacks[kind].append(entry)
+
+def _remove_callback(kind, function, args=(), kwargs={}, nodeClass='*'):
+    record(f'remove.{kind}')
+    _callbacks[kind][:] = [entry for entry in _callbacks[kind]
+                           if not (entry[0] == function and entry[3] == nodeClass)]
+
+def addKnobChanged(function, args=(), kwargs={}, nodeClass='*', node=None):
+    _add_callback('knobChanged', function, args, kwargs, nodeClass)
+
+def removeKnobChanged(function, args=(), kwargs={}, nodeClass='*', node=None):
+    _remove_callback('knobChanged', function, args, kwargs, nodeClass)
+
+def addOnCreate(function, args=(), kwargs={}, nodeClass='*'):
+    _add_callback('onCreate', function, args, kwargs, nodeClass)
+
+def removeOnCreate(function, args=(), kwargs={}, nodeClass='*'):
+    _remove_callback('onCreate', function, args, kwargs, nodeClass)
+
+def addOnUserCreate(function, args=(), kwargs={}, nodeClass='*'):
+    _add_callback('onUserCreate', function, args, kwargs, nodeClass)
+
+def removeOnUserCreate(function, args=(), kwargs={}, nodeClass='*'):
+    _remove_callback('onUserCreate', function, args, kwargs, nodeClass)
+
+def addOnDestroy(function, args=(), kwargs={}, nodeClass='*'):
+    _add_callback('onDestroy', function, args, kwargs, nodeClass)
+
+def removeOnDestroy(function, args=(), kwargs={}, nodeClass='*'):
+    _remove_callback('onDestroy', function, args, kwargs, nodeClass)
+
+def addOnScriptLoad(function, args=(), kwargs={}, nodeClass='Root'):
+    _add_callback('onScriptLoad', function, args, kwargs, '*')
+
+def removeOnScriptLoad(function, args=(), kwargs={}, nodeClass='Root'):
+    _remove_callback('onScriptLoad', function, args, kwargs, '*')
+
+def callbacks(kind):
+    """Fake-only: the registered (function, args, kwargs, nodeClass) entries of one callback kind."""
+    return list(_callbacks[kind])
+
+# Undo ---------------------------------------------------------------------
+
+class Undo(object):
+    """Records begin/end/cancel; usable as a context manager like nuke.Undo."""
+    _depth = 0
+    groups = []
+
+    def __init__(self, name=None):
+        record('Undo')
+        self._name = name
+
+    def begin(self, name=None):
+        record('Undo.begin')
+        Undo._depth += 1
+        Undo.groups.append(name or self._name)
+
+    def end(self):
+        record('Undo.end')
+        Undo._depth = max(0, Undo._depth - 1)
+
+    def cancel(self):
+        record('Undo.cancel')
+        Undo._depth = max(0, Undo._depth - 1)
+
+    def name(self, name):
+        self._name = name
+
+    def disable(self):
+        record('Undo.disable')
+
+    def enable(self):
+        record('Undo.enable')
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.end()
+
+# UI -----------------------------------------------------------------------
+
+class Menu(object):
+    def __init__(self, name):
+        self._name = name
+        self.items = {}
+
+    def name(self):
+        return self._name
+
+    def addMenu(self, name, *args, **kwargs):
+        record('Menu.addMenu', name)
+        return self.items.setdefault(name, Menu(name))
+
+    def addCommand(self, name, command=None, shortcut=None, *args, **kwargs):
+        record('Menu.addCommand', name)
+        self.items[name] = command
+        return command
+
+    def addSeparator(self, *args, **kwargs):
+        record('Menu.addSeparator')
+
+    def findItem(self, name):
+        return self.items.get(name)
+
+_menus = {}
+
+def menu(name):
+    record('menu', name)
+    return _menus.setdefault(name, Menu(name))
+
+def toolbar(name):
+    record('toolbar', name)
+    return _menus.setdefault(name, Menu(name))
+
+def message(text):
+    record('message')
+    print(text)
+
+def ask(text):
+    record('ask')
+    return True
+
+def getInput(prompt, default=''):
+    record('getInput')
+    return default
+
+def choice(title, prompt, options, default=0):
+    record('choice')
+    return default
+
+def pluginAddPath(path, addToSysPath=True):
+    record('pluginAddPath')
+    if addToSysPath and path not in sys.path:
+        sys.path.append(path)
+
+def executeInMainThread(function, args=(), kwargs={}):
+    record('executeInMainThread')
+    return function(*args, **kwargs)
+
+def executeInMainThreadWithResult(function, args=(), kwargs={}):
+    record('executeInMainThreadWithResult')
+    return function(*args, **kwargs)
+
+def scriptOpen(path):
+    record('scriptOpen')
+
+def nodePaste(path):
+    record('nodePaste')
+
+def execute(*args, **kwargs):
+    record('execute')
+
+def executing():
+    return False
+
+def formats():
+    record('formats')
+    return []
+
+def addFormat(format):
+    record('addFormat')
+
+def install():
+    """Register this module as 'nuke' and return it."""
+    module = sys.modules[__name__]
+    sys.modules['nuke'] = module
+    return module
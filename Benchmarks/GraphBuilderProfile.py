@@ -0,0 +1,110 @@
+# GraphBuilderProfile.py v1.0
+#
+# Runs the node-graph builders of the toolkit headless against FakeNuke and reports how
+# many nodes each creates, how many nuke API calls it makes and how long it takes, so
+# changes to the builders can be compared with numbers instead of by feel.
+#
+# Profiled builders:
+#   split_light_channels      (Shufflers/BatchLightShuffler.py)
+#   create_crypto_setup       (Loaders/LoadLightningRenderFromRender.py)
+#   create_contact_sheet_auto (Loaders/SequenceLoader.py)
+#   merge_color_nodes         (MergeCC.py)
+#
+# Usage:
+#   python Benchmarks/GraphBuilderProfile.py --size 20 --top 5
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+for folder in ("Loaders", "Shufflers", ""):
+    sys.path.insert(0, os.path.join(REPO_DIR, folder))
+
+import FakeNuke
+nuke = FakeNuke.install()
+
+def quiet_import(module_name):
+    """Import a tool module, hiding what it prints while running its module-level code."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return __import__(module_name)
+
+def make_read(channel_layers=()):
+    read = nuke.nodes.Read(file="/renders/SQ0010_SH0010_beauty.####.exr")
+    read.setChannels([f"{layer}.{channel}" for layer in channel_layers for channel in ("red", "green", "blue")])
+    return read
+
+def profile_split_light_channels(size):
+    BatchLightShuffler = quiet_import("BatchLightShuffler")
+    read = make_read([f"light{i:02d}" for i in range(size)] + ["lighting", "rgba"])
+    return lambda: BatchLightShuffler.split_light_channels(read)
+
+def profile_create_crypto_setup(size):
+    LoadLightningRenderFromRender = quiet_import("LoadLightningRenderFromRender")
+    selected = make_read()
+    reads = [make_read() for _ in range(size)]
+
+    def run():
+        for read in reads:
+            LoadLightningRenderFromRender.create_crypto_setup(read, selected)
+    return run
+
+def profile_create_contact_sheet_auto(size):
+    SequenceLoader = quiet_import("SequenceLoader")
+    reads = [make_read() for _ in range(size)]
+    return lambda: SequenceLoader.create_contact_sheet_auto(reads)
+
+def profile_merge_color_nodes(size):
+    MergeCC = quiet_import("MergeCC")
+    previous = make_read()
+    for i in range(size):
+        grade = nuke.nodes.Grade(inputs=[previous], multiply=1.0 + i * 0.1, ypos=i * 40)
+        grade.setSelected(True)
+        previous = grade
+    nuke.nodes.Blur(inputs=[previous])
+    return MergeCC.merge_color_nodes
+
+BUILDERS = [
+    ("split_light_channels", profile_split_light_channels),
+    ("create_crypto_setup", profile_create_crypto_setup),
+    ("create_contact_sheet_auto", profile_create_contact_sheet_auto),
+    ("merge_color_nodes", profile_merge_color_nodes),
+]
+
+def profile_builder(name, setup, size, top):
+    FakeNuke.reset(callbacks=True)
+    run = setup(size)
+    FakeNuke.reset(nodes=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+
+    created = FakeNuke.created_nodes()
+    counts = FakeNuke.call_counts()
+    print(f"{name:<27} {elapsed * 1000:8.2f} ms  {sum(created.values()):5d} nodes  {FakeNuke.total_calls():7d} API calls")
+    print(f"    nodes: {', '.join(f'{key}={value}' for key, value in sorted(created.items()))}")
+    busiest = sorted(counts.items(), key=lambda item: -item[1])[:top]
+    print(f"    top calls: {', '.join(f'{key}={value}' for key, value in busiest)}")
+    return {"seconds": elapsed, "nodes": created, "calls": counts}
+
+def run_profiles(size, top, only=None):
+    results = {}
+    for name, setup in BUILDERS:
+        if only and name not in only:
+            continue
+        results[name] = profile_builder(name, setup, size, top)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count nodes and nuke API calls made by the graph builders.")
+    parser.add_argument("--size", type=int, default=20, help="Light layers / Read nodes / Grade nodes per builder")
+    parser.add_argument("--top", type=int, default=6, help="How many of the most frequent API calls to list")
+    parser.add_argument("builders", nargs="*", help="Only profile these builders")
+    args = parser.parse_args()
+    run_profiles(args.size, args.top, args.builders)
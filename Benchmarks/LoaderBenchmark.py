@@ -0,0 +1,163 @@
+# LoaderBenchmark.py v1.1
+#
+# Times the render discovery of the loaders on a synthetic render tree and counts the
+# filesystem calls they make, so changes to RenderIndex/RenderCatalog can be compared
+# without the production share. Runs outside Nuke with the FakeNuke stand-in.
+# Each discovery function is timed and counted separately (LoaderInstrumentation.phase),
+# so the shots are probed one after the other instead of on SequenceLoader's threads.
+#
+# Scenarios:
+#   cold     - fresh index, no catalog (a new Nuke session before the persistent catalog existed)
+#   warm     - same index queried again (everything answered from memory)
+#   catalog  - fresh index backed by a populated on-disk catalog (new Nuke session)
+#
+# Usage:
+#   python Benchmarks/LoaderBenchmark.py --sequences 3 --shots 20 --layers 6 --frames 200
+#   python Benchmarks/LoaderBenchmark.py --root /path/to/existing/out/FILM
+
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARK_DIR)
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARK_DIR), "Loaders"))
+
+import FakeNuke
+FakeNuke.install()
+
+import RenderTreeGenerator
+import LoaderInstrumentation
+import RenderIndex
+import RenderCatalog
+import SequenceLoader
+import LoadLightningRender
+import ColorScriptCreator
+
+PHASES = ["find_latest_render", "find_frame_range", "find_all_render_layers", "ColorScriptCreator scan"]
+
+class PhaseCounter(object):
+    """Attributes the filesystem calls of a LoaderRun to the phase they were made in."""
+
+    def __init__(self, run):
+        self.run = run
+        self.counts = {}  # phase name -> {call type: count}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        before = self._snapshot()
+        with LoaderInstrumentation.phase(name):
+            yield
+        counts = self.counts.setdefault(name, {})
+        for call, count in self._snapshot().items():
+            if count > before.get(call, 0):
+                counts[call] = counts.get(call, 0) + count - before.get(call, 0)
+
+    def _snapshot(self):
+        return dict((call, entry[0]) for call, entry in self.run.calls.items())
+
+def discover_all(counter):
+    """Run the discovery part of every loader over the whole tree, one phase per function."""
+    index = RenderIndex.get_render_index()
+    sequences = [sequence[2:] for sequence in index.sequences()]
+
+    # SequenceLoader: latest comp render and frame range of every shot (discover_shot, unthreaded)
+    for sequence in sequences:
+        for shot in SequenceLoader.get_shot_numbers(sequence):
+            shot = shot.split('_')[1]
+            with counter.phase("find_latest_render"):
+                render_path = SequenceLoader.find_latest_render(sequence, shot, 'comp')
+            if render_path:
+                version = os.path.basename(render_path)
+                with counter.phase("find_frame_range"):
+                    SequenceLoader.find_frame_range(render_path, sequence, shot, version, 'comp')
+
+    # LoadLightningRender: newest version of every lighting layer
+    for sequence in index.sequences():
+        for shot in index.shots(sequence):
+            with counter.phase("find_all_render_layers"):
+                LoadLightningRender.find_all_render_layers(index.task_path(sequence, shot, 'lighting'))
+
+    # ColorScriptCreator: latest preview of every shot
+    with counter.phase("ColorScriptCreator scan"):
+        for sequence in ColorScriptCreator.find_all_sequences():
+            for shot in ColorScriptCreator.get_shot_numbers(sequence):
+                ColorScriptCreator.find_latest_render(sequence, shot)
+
+def run_discovery():
+    """Run discover_all instrumented; return the LoaderRun and the per-phase call counts."""
+    run = LoaderInstrumentation._active_run = LoaderInstrumentation.LoaderRun("LoaderBenchmark")
+    counter = PhaseCounter(run)
+    run.start()
+    try:
+        discover_all(counter)
+    finally:
+        run.stop()
+        LoaderInstrumentation._active_run = None
+    return run, counter.counts
+
+def reset_indexes(use_catalog):
+    RenderIndex._indexes.clear()
+    RenderIndex.USE_RENDER_CATALOG = use_catalog
+
+def format_calls(counts):
+    return ", ".join(f"{call}={count}" for call, count in sorted(counts.items())) or "none"
+
+def run_scenario(name):
+    run, phase_counts = run_discovery()
+    total_calls = dict((call, entry[0]) for call, entry in run.calls.items())
+    print(f"{name:<8} {run.total * 1000:9.1f} ms   {sum(total_calls.values()):7d} fs calls ({format_calls(total_calls)})")
+    for phase in PHASES:
+        counts = phase_counts.get(phase, {})
+        print(f"    {phase:<24} {run.phases.get(phase, 0.0) * 1000:9.1f} ms   {sum(counts.values()):7d} fs calls"
+              f" ({format_calls(counts)})")
+    return {"seconds": run.total, "calls": total_calls,
+            "phases": dict((phase, {"seconds": run.phases.get(phase, 0.0), "calls": phase_counts.get(phase, {})})
+                           for phase in PHASES)}
+
+def run_benchmark(film_root, catalog_path):
+    RenderIndex.FILM_ROOT = film_root
+    ColorScriptCreator.BASE_PATH = film_root + "/"
+    RenderCatalog.CATALOG_PATH = catalog_path
+    LoadLightningRender.print_debug = lambda message: None
+
+    results = {}
+    reset_indexes(False)
+    results["cold"] = run_scenario("cold")
+    results["warm"] = run_scenario("warm")
+
+    # Populate the catalog once, then measure a fresh index that can reuse it
+    reset_indexes(True)
+    run_discovery()
+    RenderCatalog.get_catalog().flush()
+    reset_indexes(True)
+    results["catalog"] = run_scenario("catalog")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark loader render discovery on a synthetic tree.")
+    parser.add_argument("--root", help="Existing out/FILM folder to benchmark instead of generating one")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated tree and catalog")
+    RenderTreeGenerator.add_arguments(parser)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="loader_benchmark_")
+    try:
+        if args.root:
+            film_root = RenderIndex.normalize_path(args.root)
+        else:
+            start = time.perf_counter()
+            film_root = RenderTreeGenerator.generate_render_tree(
+                work_dir, args.sequences, args.shots, args.layers, args.versions, args.frames,
+                legacy_layout=args.legacy_layout)
+            print(f"Generated {film_root} in {time.perf_counter() - start:.1f} s")
+        run_benchmark(film_root, os.path.join(work_dir, "render_catalog.sqlite"))
+    finally:
+        if args.keep:
+            print(f"Kept {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,82 @@
+# RenderTreeGenerator.py v1.0
+#
+# Builds a synthetic copy of the published out/FILM tree in a temp folder so the loaders
+# can be measured without the production share. All files are empty.
+#
+# Layout written for every SQxxxx/SHxxxx:
+#   lighting/render/vNNN/SQxxxx_SHxxxx_<layer>/SQxxxx_SHxxxx_<layer>.####.exr
+#   compositing/render/vNNN/pp_FILM_SQxxxx_SHxxxx_comp_vNNN.######.exr
+#   compositing/preview/FILM_SQxxxx_SHxxxx_comp_vNNN.mov
+#
+# Usage:
+#   python RenderTreeGenerator.py --sequences 2 --shots 10 --layers 5 --versions 2 --frames 100
+
+import argparse
+import os
+import tempfile
+
+DEFAULT_LAYERS = ['beauty', 'char', 'env', 'fx', 'volume', 'crypto', 'utility', 'shadow']
+
+def layer_names(count):
+    names = DEFAULT_LAYERS[:count]
+    names += [f"layer{i:02d}" for i in range(len(names), count)]
+    return names
+
+def touch(path):
+    open(path, 'w').close()
+
+def generate_render_tree(root=None, sequences=2, shots=10, layers=5, versions=2, frames=100,
+                         first_frame=1001, legacy_layout=False):
+    """Write the tree and return its out/FILM root.
+
+    With legacy_layout the lighting renders use the older render/<pass>/exr.<layer>/vNNN/
+    layout that RenderIndex.find_layer_folders() has to discover.
+    """
+    root = root or tempfile.mkdtemp(prefix="render_tree_")
+    film_root = os.path.join(root, "out", "FILM").replace("\\", "/")
+    frame_numbers = range(first_frame, first_frame + frames)
+
+    for seq_index in range(1, sequences + 1):
+        sequence = f"SQ{seq_index * 10:04d}"
+        for shot_index in range(1, shots + 1):
+            shot = f"SH{shot_index * 10:04d}"
+            shot_path = os.path.join(film_root, sequence, shot)
+
+            for version_index in range(1, versions + 1):
+                version = f"v{version_index:03d}"
+                for layer in layer_names(layers):
+                    layer_name = f"{sequence}_{shot}_{layer}"
+                    if legacy_layout:
+                        layer_path = os.path.join(shot_path, "lighting", "render", "main", f"exr.{layer}", version)
+                    else:
+                        layer_path = os.path.join(shot_path, "lighting", "render", version, layer_name)
+                    os.makedirs(layer_path, exist_ok=True)
+                    for frame in frame_numbers:
+                        touch(os.path.join(layer_path, f"{layer_name}.{frame:04d}.exr"))
+
+                comp_path = os.path.join(shot_path, "compositing", "render", version)
+                os.makedirs(comp_path, exist_ok=True)
+                for frame in frame_numbers:
+                    touch(os.path.join(comp_path, f"pp_FILM_{sequence}_{shot}_comp_{version}.{frame:06d}.exr"))
+
+                preview_path = os.path.join(shot_path, "compositing", "preview")
+                os.makedirs(preview_path, exist_ok=True)
+                touch(os.path.join(preview_path, f"FILM_{sequence}_{shot}_comp_{version}.mov"))
+
+    return film_root
+
+def add_arguments(parser):
+    parser.add_argument("--sequences", type=int, default=2)
+    parser.add_argument("--shots", type=int, default=10)
+    parser.add_argument("--layers", type=int, default=5)
+    parser.add_argument("--versions", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--legacy-layout", action="store_true", help="Use the exr.<layer>/vNNN lighting layout")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic out/FILM render tree.")
+    parser.add_argument("root", nargs="?", help="Folder to write into (a new temp folder by default)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(generate_render_tree(args.root, args.sequences, args.shots, args.layers, args.versions,
+                               args.frames, legacy_layout=args.legacy_layout))
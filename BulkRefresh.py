@@ -0,0 +1,150 @@
+# BulkRefresh.py v1.1
+#
+# One pass over all nodes for the toolkit's "update every existing node" work.
+# Tools register an updater (a function called with one node) for the node classes it
+# handles; on script load every node is visited once and handed to the updaters of its
+# class. In the GUI the pass runs on the main thread in slices of SLICE_MS, with the
+# event loop running in between, so the script can be used while the refresh finishes.
+# When it is done, the total time and the time spent in each updater are printed.
+# PySide2 is imported only for the GUI's slice timer: without a GUI (nuke -t, render farm,
+# FakeNuke) the pass runs synchronously, and the tools that register updaters import cleanly.
+#
+# Usage in a tool:
+#   BulkRefresh.register("AdvancedShuffle", update_shuffle_node, node_classes=['Shuffle', 'Shuffle2'])
+#
+# Registering only adds the updater (registering again under the same name replaces it), so
+# tools imported one after the other share a single pass: it runs on script load, and
+# menu.py schedules one after loading the callback tools for the nodes already there.
+
+import time
+import nuke
+import GuardedKnobs
+
+# User variables
+SLICE_MS = 20  # Milliseconds of refresh work between two event loop turns
+REPORT_REFRESH = True  # Print the refresh timings in the Script Editor
+ANY = '*'
+
+class Updater(object):
+    def __init__(self, name, function, node_classes, exclude_classes):
+        self.name = name
+        self.function = function
+        self.tool = function.__module__  # Owner of the updater's GuardedKnobs writes
+        self.node_classes = None if node_classes == ANY else frozenset(node_classes)
+        self.exclude_classes = frozenset(exclude_classes)
+
+    def wants(self, node_class):
+        if node_class in self.exclude_classes:
+            return False
+        return self.node_classes is None or node_class in self.node_classes
+
+class Refresh(object):
+    """A fused pass over all nodes, run in time slices."""
+
+    def __init__(self, updaters):
+        self.updaters = list(updaters)
+        self.nodes = nuke.allNodes()
+        self.index = 0
+        self.routes = {}  # node class -> updaters
+        self.timings = dict((updater.name, [0.0, 0]) for updater in self.updaters)  # name -> [seconds, nodes]
+        self.slices = 0
+        self.start = time.perf_counter()
+        self.timer = None
+
+    def schedule_slice(self):
+        """Run the next slice once the event loop is back (GUI only)."""
+        if self.timer is None:
+            from PySide2 import QtCore  # Only needed in the GUI, so the pass also runs headless
+            self.timer = QtCore.QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.setInterval(0)
+            self.timer.timeout.connect(self.run_slice)
+        self.timer.start()
+
+    def route(self, node_class):
+        updaters = self.routes.get(node_class)
+        if updaters is None:
+            updaters = self.routes[node_class] = [u for u in self.updaters if u.wants(node_class)]
+        return updaters
+
+    def run_slice(self, seconds=None):
+        """Refresh nodes until seconds (default SLICE_MS) have passed; schedule the rest."""
+        deadline = time.perf_counter() + (SLICE_MS / 1000.0 if seconds is None else seconds)
+        self.slices += 1
+        nodes = self.nodes
+        while self.index < len(nodes):
+            node = nodes[self.index]
+            self.index += 1
+            try:
+                updaters = self.route(node.Class())
+            except ValueError:  # Deleted since the pass started
+                continue
+            for updater in updaters:
+                start = time.perf_counter()
+                try:
+                    with GuardedKnobs.writing_as(updater.tool):
+                        updater.function(node)
+                except Exception as e:
+                    print(f"{updater.name} failed to refresh {node.name()}: {str(e)}")
+                timing = self.timings[updater.name]
+                timing[0] += time.perf_counter() - start
+                timing[1] += 1
+            if time.perf_counter() >= deadline:
+                break
+        if self.index < len(nodes):
+            self.schedule_slice()
+        else:
+            self.finish()
+
+    def run_all(self):
+        self.run_slice(float('inf'))
+
+    def cancel(self):
+        if self.timer is not None:
+            self.timer.stop()
+
+    def finish(self):
+        global _current, last_refresh
+        if _current is self:
+            _current = None
+        last_refresh = self
+        if REPORT_REFRESH and self.updaters:
+            print(format_report(self))
+
+def format_report(refresh):
+    total = time.perf_counter() - refresh.start
+    parts = [f"{name} {seconds:.2f}s ({count} nodes)" for name, (seconds, count) in refresh.timings.items()]
+    return (f"Node refresh: {len(refresh.nodes)} nodes in {total:.2f}s ({refresh.slices} slices): "
+            + ", ".join(parts))
+
+_updaters = []
+_current = None
+last_refresh = None  # The most recently finished Refresh, e.g. for its timings
+
+def register(name, function, node_classes=ANY, exclude_classes=()):
+    """Add (or replace) an updater called with every existing node of node_classes on script load."""
+    _updaters[:] = [u for u in _updaters if u.name != name] + [Updater(name, function, node_classes, exclude_classes)]
+    nuke.removeOnScriptLoad(schedule)
+    nuke.addOnScriptLoad(schedule)
+
+def unregister(name):
+    _updaters[:] = [u for u in _updaters if u.name != name]
+
+def schedule():
+    """Start a refresh of all nodes, replacing one still in progress."""
+    global _current
+    if _current is not None:
+        _current.cancel()
+    _current = Refresh(_updaters)
+    if nuke.GUI:
+        # Runs once the event loop is back, i.e. after the script (or menu.py) finished loading
+        _current.schedule_slice()
+    else:
+        _current.run_all()
+
+def refresh_now():
+    """Refresh all nodes synchronously, e.g. from the Script Editor."""
+    schedule()
+    if _current is not None:
+        _current.cancel()
+        _current.run_all()
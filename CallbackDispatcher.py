@@ -0,0 +1,179 @@
+# CallbackDispatcher.py v1.1
+#
+# Single entry point for the toolkit's knobChanged, onCreate, onUserCreate and onDestroy callbacks.
+# Nuke calls one dispatcher function per event; it reads the node and knob once and looks
+# up the handlers interested in that (node class, knob name) pair in a route table.
+# Routes are computed the first time a pair is seen and cached, so a knob change nobody
+# is interested in costs one dict lookup instead of a Python call per tool.
+#
+# Handlers run (and their refreshes are deferred) as their tool's GuardedKnobs writer: the
+# knobChanged caused by a handler's GuardedKnobs.set_value() write is not routed back to
+# that handler, so it cannot wake itself, but the other handlers still receive it.
+#
+# CallbackProfiler.start() sets profiler, which then times every handler call, including
+# the deferred refreshes run when a CallbackSuspension ends.
+#
+# While CallbackSuspension is active, knobChanged events are handed to
+# CallbackSuspension.defer_callback with each handler's refresh function instead.
+#
+# Usage in a tool:
+#   def on_knob_changed(node, knob):
+#       update_crypto_node(node)
+#
+#   CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, on_knob_changed,
+#                               node_classes=['Cryptomatte', 'Cryptomatte2'],
+#                               knobs=['cryptoLayer', 'matteList'], refresh=update_crypto_node)
+#   CallbackDispatcher.register(CallbackDispatcher.ON_USER_CREATE, update_crypto_node,
+#                               node_classes=['Cryptomatte', 'Cryptomatte2'])
+
+import nuke
+import CallbackSuspension
+import GuardedKnobs
+
+KNOB_CHANGED = 'knobChanged'
+ON_CREATE = 'onCreate'
+ON_USER_CREATE = 'onUserCreate'
+ON_DESTROY = 'onDestroy'
+ANY = '*'
+
+class Handler(object):
+    def __init__(self, function, node_classes, knobs, exclude_classes, ignore_knobs, refresh):
+        self.function = function
+        self.key = (function.__module__, function.__qualname__)
+        self.tool = function.__module__  # Owner of the handler's GuardedKnobs writes
+        self.node_classes = None if node_classes == ANY else frozenset(node_classes)
+        self.knobs = None if knobs == ANY else frozenset(knobs)
+        self.exclude_classes = frozenset(exclude_classes)
+        self.ignore_knobs = frozenset(ignore_knobs)
+        self.refresh = refresh
+
+    def wants(self, node_class, knob_name):
+        if node_class in self.exclude_classes:
+            return False
+        if self.node_classes is not None and node_class not in self.node_classes:
+            return False
+        if knob_name is None:  # Create events, and knobChanged without a knob
+            return True
+        return knob_name not in self.ignore_knobs and (self.knobs is None or knob_name in self.knobs)
+
+    def run_refresh(self, node):
+        """Run refresh(node) like a live event (profiled, budgeted); queued while callbacks are suspended."""
+        _call(self, node, run=_run_refresh)
+
+_handlers = {KNOB_CHANGED: [], ON_CREATE: [], ON_USER_CREATE: [], ON_DESTROY: []}
+_routes = {KNOB_CHANGED: {}, ON_CREATE: {}, ON_USER_CREATE: {}, ON_DESTROY: {}}  # kind -> (node class, knob name) -> handlers
+_installed = {KNOB_CHANGED: set(), ON_CREATE: set(), ON_USER_CREATE: set(), ON_DESTROY: set()}  # kind -> node classes registered with Nuke
+profiler = None  # CallbackProfiler.Profiler while profiling
+
+def register(kind, function, node_classes=ANY, knobs=ANY, exclude_classes=(), ignore_knobs=(), refresh=None):
+    """Route kind events of node_classes to function.
+
+    knobChanged handlers are called as function(node, knob) for the listed knobs (minus
+    ignore_knobs); create and destroy handlers as function(node). refresh(node) is queued
+    instead while callbacks are suspended, and defaults to calling function without a knob.
+    Registering the same function again (e.g. after a module reload) replaces it.
+    """
+    if kind == KNOB_CHANGED and refresh is None:
+        refresh = lambda node: function(node, None)
+    handler = Handler(function, node_classes, knobs, exclude_classes, ignore_knobs, refresh)
+    _handlers[kind][:] = [h for h in _handlers[kind] if h.key != handler.key] + [handler]
+    _routes[kind].clear()
+    install(kind)
+
+def unregister(kind, function):
+    key = (function.__module__, function.__qualname__)
+    _handlers[kind][:] = [h for h in _handlers[kind] if h.key != key]
+    _routes[kind].clear()
+    install(kind)
+
+def handlers_for(kind, node_class, knob_name=None):
+    """Return the handlers routed for a (node class, knob name) pair, computing the route once."""
+    route = _routes[kind].get((node_class, knob_name))
+    if route is None:
+        route = _routes[kind][(node_class, knob_name)] = tuple(
+            h for h in _handlers[kind] if h.wants(node_class, knob_name))
+    return route
+
+def on_knob_changed():
+    node = nuke.thisNode()
+    knob = nuke.thisKnob()
+    key = (node.Class(), knob.name() if knob is not None else None)
+    route = _routes[KNOB_CHANGED].get(key)
+    if route is None:
+        route = handlers_for(KNOB_CHANGED, *key)
+    if not route:
+        return
+    if GuardedKnobs.active_writes:
+        # A handler does not see its own writes; the other handlers do
+        route = tuple(h for h in route if not GuardedKnobs.is_writing(node, knob, h.tool))
+        if not route:
+            return
+    if CallbackSuspension.is_suspended():
+        for handler in route:
+            CallbackSuspension.defer_callback(handler.run_refresh, node, knob)
+        return
+    for handler in route:
+        _call(handler, node, knob)
+
+def on_create():
+    node = nuke.thisNode()
+    for handler in handlers_for(ON_CREATE, node.Class()):
+        _call(handler, node)
+
+def on_user_create():
+    node = nuke.thisNode()
+    for handler in handlers_for(ON_USER_CREATE, node.Class()):
+        _call(handler, node)
+
+def on_destroy():
+    node = nuke.thisNode()
+    for handler in handlers_for(ON_DESTROY, node.Class()):
+        _call(handler, node)
+
+def _call(handler, *args, run=None):
+    run = run or _run
+    if profiler is not None:
+        profiler.call(handler, args, run)
+    else:
+        run(handler, args)
+
+def _run(handler, args):
+    # One failing tool must not stop the others from seeing the event
+    try:
+        with GuardedKnobs.writing_as(handler.tool):
+            handler.function(*args)
+    except Exception as e:
+        print(f"Callback {handler.function.__name__} failed: {str(e)}")
+
+def _run_refresh(handler, args):
+    try:
+        with GuardedKnobs.writing_as(handler.tool):
+            handler.refresh(*args)
+    except Exception as e:
+        print(f"Deferred callback {handler.function.__name__} failed: {str(e)}")
+
+def install(kind):
+    """Register the dispatcher with Nuke for the node classes the kind's handlers need.
+
+    Handlers limited to a few classes keep Nuke filtering the events before Python is
+    called; a handler interested in every class installs the dispatcher for '*'.
+    """
+    add, remove = {
+        KNOB_CHANGED: (nuke.addKnobChanged, nuke.removeKnobChanged),
+        ON_CREATE: (nuke.addOnCreate, nuke.removeOnCreate),
+        ON_USER_CREATE: (nuke.addOnUserCreate, nuke.removeOnUserCreate),
+        ON_DESTROY: (nuke.addOnDestroy, nuke.removeOnDestroy),
+    }[kind]
+    dispatch = {KNOB_CHANGED: on_knob_changed, ON_CREATE: on_create, ON_USER_CREATE: on_user_create,
+                ON_DESTROY: on_destroy}[kind]
+    classes = set()
+    for handler in _handlers[kind]:
+        if handler.node_classes is None:
+            classes = set([ANY])
+            break
+        classes.update(handler.node_classes)
+    for node_class in _installed[kind] - classes:
+        remove(dispatch, nodeClass=node_class)
+    for node_class in classes - _installed[kind]:
+        add(dispatch, nodeClass=node_class)
+    _installed[kind] = classes
@@ -0,0 +1,124 @@
+# CallbackProfiler.py v1.1
+#
+# Profiling mode for the callbacks routed by CallbackDispatcher (NodeLabeler, CryptoLabeler,
+# AdvancedShuffle, CryptoMatteFixer, InferenceNodeCallback). While profiling, every handler
+# call is timed, deferred refreshes included: the report lists per handler the call count,
+# cumulative and p99 latency, and the knobs that triggered it.
+#
+# With TIME_BUDGET_SECONDS set, a handler that spends more than that in one session is
+# disabled (it stops being called until enable() or the next session) and a warning is printed.
+#
+# Usage (Script Editor):
+#   import CallbackProfiler
+#   CallbackProfiler.start()
+#   ...work in the comp...
+#   CallbackProfiler.print_report()
+#   CallbackProfiler.stop()
+#
+# Set ENABLE_PROFILING to True to start profiling from menu.py at startup.
+
+import time
+from collections import Counter, deque
+import CallbackDispatcher
+
+# User variables
+ENABLE_PROFILING = False  # Start profiling at Nuke startup
+TIME_BUDGET_SECONDS = 0  # Per handler and session; 0 disables the budget
+LATENCY_SAMPLES = 10000  # Most recent call latencies kept per handler for the p99
+TOP_KNOBS = 5  # Knobs listed per handler in the report
+
+class HandlerStats(object):
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.knobs = Counter()
+        self.disabled = False
+
+    def p99(self):
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+class Profiler(object):
+    def __init__(self):
+        self.stats = {}  # handler key -> HandlerStats
+        self.start = time.perf_counter()
+
+    def call(self, handler, args, run):
+        """Time one handler call made by the dispatcher; skip handlers over budget."""
+        stats = self.stats.get(handler.key)
+        if stats is None:
+            stats = self.stats[handler.key] = HandlerStats('.'.join(handler.key))
+        if stats.disabled:
+            return
+        start = time.perf_counter()
+        try:
+            run(handler, args)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.latencies.append(elapsed)
+            knob = args[1] if len(args) > 1 else None
+            if knob is not None:
+                stats.knobs[knob.name()] += 1
+            else:
+                stats.knobs['<refresh>' if run is CallbackDispatcher._run_refresh else '<create>'] += 1
+            if TIME_BUDGET_SECONDS and stats.seconds > TIME_BUDGET_SECONDS:
+                stats.disabled = True
+                print(f"CallbackProfiler: {stats.name} disabled after {stats.seconds:.2f}s "
+                      f"in {stats.calls} calls (budget {TIME_BUDGET_SECONDS}s)")
+
+_profiler = None
+
+def start():
+    """Start (or restart) profiling the dispatcher's handlers."""
+    global _profiler
+    _profiler = CallbackDispatcher.profiler = Profiler()
+
+def stop():
+    global _profiler
+    CallbackDispatcher.profiler = None
+    _profiler = None
+
+def is_profiling():
+    return _profiler is not None
+
+def enable(name):
+    """Re-enable a handler disabled by the time budget, e.g. enable('NodeLabeler.on_knob_changed')."""
+    if _profiler is not None:
+        for stats in _profiler.stats.values():
+            if stats.name == name:
+                stats.disabled = False
+
+def report():
+    if _profiler is None:
+        return {}
+    return {
+        "seconds": round(time.perf_counter() - _profiler.start, 3),
+        "handlers": {stats.name: {
+            "calls": stats.calls,
+            "seconds": round(stats.seconds, 6),
+            "p99_ms": round(stats.p99() * 1000, 3),
+            "disabled": stats.disabled,
+            "knobs": dict(stats.knobs.most_common(TOP_KNOBS)),
+        } for stats in sorted(_profiler.stats.values(), key=lambda stats: -stats.seconds)},
+    }
+
+def format_report():
+    data = report()
+    if not data:
+        return "CallbackProfiler is not running."
+    lines = [f"Callbacks over {data['seconds']:.1f}s:"]
+    for name, entry in data["handlers"].items():
+        disabled = " (disabled)" if entry["disabled"] else ""
+        knobs = ", ".join(f"{knob} {count}" for knob, count in entry["knobs"].items())
+        lines.append(f"  {name}{disabled}: {entry['calls']} calls, {entry['seconds'] * 1000:.1f} ms, "
+                     f"p99 {entry['p99_ms']:.3f} ms; knobs: {knobs}")
+    return "\n".join(lines)
+
+def print_report():
+    print(format_report())
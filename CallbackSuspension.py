@@ -0,0 +1,74 @@
+# CallbackSuspension.py v1.0
+#
+# Shared switch that lets a tool suspend the toolkit's knobChanged callbacks while it
+# makes many position-only changes (e.g. AdvancedGrabTool moving thousands of nodes).
+# While suspended, the label/colour/Cryptomatte/Shuffle callbacks return immediately:
+# xpos/ypos changes are dropped because nothing they compute depends on position, and
+# any other change queues a single refresh of that node, run once when the suspension ends.
+#
+# Usage in a tool:
+#   with CallbackSuspension.suspended():
+#       ...move nodes...
+#   # or suspend() / resume() around a grab that spans several Qt events
+#
+# Callbacks registered through CallbackDispatcher are deferred automatically. A callback
+# registered directly with Nuke does it itself:
+#   node = nuke.thisNode()
+#   if CallbackSuspension.defer_callback(update_node, node, nuke.thisKnob()):
+#       return
+
+from contextlib import contextmanager
+
+POSITION_KNOBS = ('xpos', 'ypos')
+
+_depth = 0
+_deferred = {}  # (refresh function, node name) -> (refresh function, node)
+
+def is_suspended():
+    return _depth > 0
+
+def suspend():
+    """Start suspending callbacks. Calls nest; every suspend() needs a matching resume()."""
+    global _depth
+    _depth += 1
+
+def resume():
+    """End one suspend(); the outermost resume runs the deferred refreshes once per node."""
+    global _depth
+    if _depth == 0:
+        return
+    _depth -= 1
+    if _depth == 0:
+        run_deferred()
+
+@contextmanager
+def suspended():
+    suspend()
+    try:
+        yield
+    finally:
+        resume()
+
+def defer_callback(refresh, node, knob=None):
+    """Return True if a knobChanged callback should return now because callbacks are suspended.
+
+    Position changes are dropped; any other change queues refresh(node) for resume().
+    """
+    if _depth == 0:
+        return False
+    if knob is not None and knob.name() in POSITION_KNOBS:
+        return True
+    try:
+        _deferred.setdefault((refresh, node.fullName()), (refresh, node))
+    except ValueError:  # Node was deleted
+        pass
+    return True
+
+def run_deferred():
+    pending = list(_deferred.values())
+    _deferred.clear()
+    for refresh, node in pending:
+        try:
+            refresh(node)
+        except Exception as e:
+            print(f"Deferred callback {refresh.__name__} failed: {str(e)}")
@@ -1,4 +1,4 @@
-# InferenceNodeCallback.py v1.1
+# InferenceNodeCallback.py v1.2
 #
 # DESCRIPTION:
 # This script adds auto-coloring and naming functionality to Inference nodes.
@@ -20,6 +20,7 @@ import colorsys
 import re
 import os
 import hashlib
+import CallbackDispatcher
 
 # User Variables
 COLOR_SATURATION = 0.7  # Color saturation (0-1)
@@ -103,27 +104,23 @@ def update_inference_node(node):
         if DEBUG:
             print(f"Error in update_inference_node: {str(e)}")
 
-def inference_knob_changed():
-    """Callback function for Inference node knob changes."""
-    node = nuke.thisNode()
-    knob = nuke.thisKnob()
-    
-    if knob.name() == "modelFile":
-        update_inference_node(node)
+def inference_knob_changed(node, knob):
+    """Callback function for changes of the modelFile knob of Inference nodes."""
+    update_inference_node(node)
 
-def onCreateCallback():
+def onCreateCallback(node):
     """Callback function that runs when a node is created."""
-    node = nuke.thisNode()
     # Run update immediately after creation
     update_inference_node(node)
 
 def add_inference_callbacks():
     """Add all callbacks to Inference nodes."""
     # Add callback for knob changes
-    nuke.addKnobChanged(inference_knob_changed, nodeClass='Inference')
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, inference_knob_changed,
+                                node_classes=['Inference'], knobs=['modelFile'], refresh=update_inference_node)
     
     # Add callback for node creation
-    nuke.addOnCreate(onCreateCallback, nodeClass='Inference')
+    CallbackDispatcher.register(CallbackDispatcher.ON_CREATE, onCreateCallback, node_classes=['Inference'])
     
     if DEBUG:
         print("Added callbacks to Inference nodes")
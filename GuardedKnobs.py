@@ -0,0 +1,66 @@
+# GuardedKnobs.py v1.1
+#
+# Guarded knob setters for the toolkit's callbacks. set_value() compares before writing,
+# so refreshing a label or color that is already right does not trigger another
+# knobChanged and a DAG redraw. A write records the tool making it (the module of the
+# callback or refresh running at the time, see writing_as); CallbackDispatcher does not
+# route the knobChanged it causes back to that tool, so a callback cannot wake itself,
+# while the other tools still see the change (e.g. CryptoMatteFixer fixing cryptoLayer
+# still updates CryptoLabeler's label).
+#
+# Usage:
+#   GuardedKnobs.set_value(node, 'label', new_label)
+#   with GuardedKnobs.writing_as('NodeLabeler'):   # done by CallbackDispatcher and BulkRefresh
+#       ...
+#   print(GuardedKnobs.summary())   # e.g. "Knob writes: 120 written, 4381 suppressed, 0 callbacks blocked"
+
+from contextlib import contextmanager
+
+stats = {'written': 0, 'suppressed': 0, 'blocked': 0}
+active_writes = {}  # (node full name, knob name) -> tool writing it with set_value, or None
+writer = None  # Tool whose callback or refresh is running
+
+@contextmanager
+def writing_as(tool):
+    """Attribute the guarded writes made in the block to tool (a module name)."""
+    global writer
+    previous = writer
+    writer = tool
+    try:
+        yield
+    finally:
+        writer = previous
+
+def set_value(node, knob_name, value):
+    """Set node[knob_name] to value unless it already has that value. Returns True if written."""
+    knob = node[knob_name]
+    if knob.value() == value:
+        stats['suppressed'] += 1
+        return False
+    key = (node.fullName(), knob_name)
+    outer = active_writes.get(key, key)  # Another tool's write of the same knob in progress
+    active_writes[key] = writer
+    try:
+        knob.setValue(value)
+    finally:
+        if outer is key:
+            del active_writes[key]
+        else:
+            active_writes[key] = outer
+    stats['written'] += 1
+    return True
+
+def is_writing(node, knob, tool):
+    """Return True (and count it) if knob's change comes from a guarded write by tool in progress."""
+    if knob is None or tool is None or active_writes.get((node.fullName(), knob.name())) != tool:
+        return False
+    stats['blocked'] += 1
+    return True
+
+def reset_stats():
+    for key in stats:
+        stats[key] = 0
+
+def summary():
+    return (f"Knob writes: {stats['written']} written, {stats['suppressed']} suppressed, "
+            f"{stats['blocked']} callbacks blocked")
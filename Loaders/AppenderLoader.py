@@ -6,10 +6,11 @@
 # It now includes a "Play" button that simply simulates Alt+F and Enter key presses.
 
 import nuke
-import os
 import re
 import random
 import colorsys
+import RenderIndex
+import LoaderInstrumentation
 
 def get_current_sequence():
     script_name = nuke.root().name()
@@ -27,14 +28,11 @@ def get_sequence_from_user(current_sequence):
     return sequence
 
 def get_shot_numbers(sequence):
-    return [f"{sequence}_{i:04d}" for i in range(10, 1000, 10)]
+    shots = RenderIndex.get_render_index().shots(f"SQ{sequence}")
+    return [f"{sequence}_{shot[2:]}" for shot in shots]
 
 def find_latest_render(sequence, shot):
-    base_path = f"Y:/20105_Pysna_film/out/FILM/SQ{sequence}/SH{shot}/compositing/preview/"
-    if not os.path.exists(base_path):
-        return None
-    files = [f for f in os.listdir(base_path) if f.endswith('.mov')]
-    return os.path.join(base_path, max(files)) if files else None
+    return RenderIndex.get_render_index().latest_preview(f"SQ{sequence}", f"SH{shot}")
 
 def create_read_node(sequence, shot, render_path, color):
     full_path = render_path
@@ -117,6 +115,7 @@ def generate_color(index, total):
     r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
     return int(r * 255) << 24 | int(g * 255) << 16 | int(b * 255) << 8 | 255
 
+@LoaderInstrumentation.instrumented("AppenderLoader")
 def load_sequence_and_create_append_clip():
     write_node = find_write_node()
     if not write_node:
@@ -130,6 +129,7 @@ def load_sequence_and_create_append_clip():
     sequences = []
     
     current_sequence = get_current_sequence()
+    RenderIndex.get_render_index(refresh=True)
     
     while True:
         sequence = get_sequence_from_user(current_sequence)
@@ -139,14 +139,18 @@ def load_sequence_and_create_append_clip():
         sequences.append(sequence)
         current_sequence = f"{int(sequence) + 10:04d}"  # Increment for next iteration
     
-    for index, sequence in enumerate(sequences):
+    renders = []
+    with LoaderInstrumentation.phase("discovery"):
+        for index, sequence in enumerate(sequences):
+            for shot in get_shot_numbers(sequence):
+                render_path = find_latest_render(sequence, shot.split('_')[1])
+                if render_path:
+                    renders.append((index, sequence, shot.split('_')[1], render_path))
+    
+    for index, sequence, shot, render_path in renders:
         color = generate_color(index, len(sequences))
-        
-        for shot in get_shot_numbers(sequence):
-            render_path = find_latest_render(sequence, shot.split('_')[1])
-            if render_path:
-                read_node = create_read_node(sequence, shot.split('_')[1], render_path, color)
-                all_read_nodes.append(read_node)
+        read_node = create_read_node(sequence, shot, render_path, color)
+        all_read_nodes.append(read_node)
     
     if all_read_nodes:
         spacing_x, spacing_y = 250, 250
@@ -8,6 +8,8 @@
 import nuke
 import os
 import re
+import RenderIndex
+import LoaderInstrumentation
 
 def debug_print(message):
     print(f"DEBUG: {message}")
@@ -28,15 +30,15 @@ def get_shot_info():
         return None, None
 
 def get_latest_camera_file(base_path, sequence, shot):
-    camera_path = os.path.join(base_path, sequence, shot, "animation", "camera")
-    camera_path = camera_path.replace('\\', '/')
+    index = RenderIndex.get_render_index(base_path)
+    camera_path = index.task_path(sequence, shot, "animation", "camera")
     debug_print(f"Searching for camera files in: {camera_path}")
     
-    if not os.path.exists(camera_path):
+    if not index.is_dir(camera_path):
         debug_print(f"Camera path does not exist: {camera_path}")
         return None
     
-    camera_files = [f for f in os.listdir(camera_path) if f.endswith(".abc") and "anim.cam" in f]
+    camera_files = [f for f in index.files(camera_path, ".abc") if "anim.cam" in f]
     debug_print(f"Found camera files: {camera_files}")
     
     if not camera_files:
@@ -69,9 +71,11 @@ def create_backdrop(node):
     )
     return backdrop
 
+@LoaderInstrumentation.instrumented("CameraLoader")
 def load_or_update_camera():
     base_path = "Y:/20105_Pysna_film/out/FILM"
     debug_print(f"Base path: {base_path}")
+    RenderIndex.get_render_index(base_path, refresh=True)
     
     sequence, shot = get_shot_info()
     
@@ -79,7 +83,8 @@ def load_or_update_camera():
         nuke.message("Unable to determine sequence and shot numbers from the script name.")
         return
     
-    latest_camera_file = get_latest_camera_file(base_path, sequence, shot)
+    with LoaderInstrumentation.phase("discovery"):
+        latest_camera_file = get_latest_camera_file(base_path, sequence, shot)
     if not latest_camera_file:
         nuke.message(f"No camera file found for {sequence} {shot}.")
         return
@@ -114,4 +119,5 @@ def run_script():
         load_or_update_camera()
 
 # Run the script
-run_script()
+if __name__ == "__main__":
+    run_script()
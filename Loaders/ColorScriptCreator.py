@@ -7,10 +7,11 @@
 # and ensuring a 4K final output.
 
 import nuke
-import os
 import re
 import random
 import colorsys
+import RenderIndex
+import LoaderInstrumentation
 
 # User variables
 BASE_PATH = "Y:/20105_Pysna_film/out/FILM/"
@@ -25,18 +26,13 @@ CROP_RIGHT = 2048
 CROP_BOTTOM = 1080
 
 def find_all_sequences():
-    return [d for d in os.listdir(BASE_PATH) if d.startswith('SQ') and os.path.isdir(os.path.join(BASE_PATH, d))]
+    return RenderIndex.get_render_index(BASE_PATH).sequences()
 
 def get_shot_numbers(sequence):
-    sequence_path = os.path.join(BASE_PATH, sequence)
-    return [d for d in os.listdir(sequence_path) if d.startswith('SH') and os.path.isdir(os.path.join(sequence_path, d))]
+    return RenderIndex.get_render_index(BASE_PATH).shots(sequence)
 
 def find_latest_render(sequence, shot):
-    base_path = os.path.join(BASE_PATH, sequence, shot, 'compositing', 'preview')
-    if not os.path.exists(base_path):
-        return None
-    files = [f for f in os.listdir(base_path) if f.endswith('.mov')]
-    return os.path.join(base_path, max(files)) if files else None
+    return RenderIndex.get_render_index(BASE_PATH).latest_preview(sequence, shot)
 
 def create_read_crop_and_reformat_node(sequence, shot, render_path, color):
     unique_name = f"Read_{sequence}_{shot}_{random.randint(1000, 9999)}"
@@ -134,26 +130,29 @@ def generate_color(index, total):
     r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
     return int(r * 255) << 24 | int(g * 255) << 16 | int(b * 255) << 8 | 255
 
+@LoaderInstrumentation.instrumented("ColorScriptCreator")
 def load_all_sequences_and_create_color_script():
     all_reformat_nodes = []
     sequences = {}
     
-    all_sequences = find_all_sequences()
-    total_sequences = len(all_sequences)
+    renders = []
+    with LoaderInstrumentation.phase("discovery"):
+        RenderIndex.get_render_index(BASE_PATH, refresh=True)
+        all_sequences = find_all_sequences()
+        for sequence in all_sequences:
+            shots = get_shot_numbers(sequence)
+            sequences[sequence] = shots
+            renders.extend((sequence, shot, find_latest_render(sequence, shot)) for shot in shots)
     
-    for index, sequence in enumerate(all_sequences):
-        color = generate_color(index, total_sequences)
-        shots = get_shot_numbers(sequence)
-        sequences[sequence] = shots
-        
-        for shot in shots:
-            render_path = find_latest_render(sequence, shot)
-            if render_path:
-                reformat_node = create_read_crop_and_reformat_node(sequence, shot, render_path, color)
-                if reformat_node:
-                    all_reformat_nodes.append(reformat_node)
-            else:
-                print(f"No render found for {sequence} {shot}")
+    total_sequences = len(all_sequences)
+    colors = {sequence: generate_color(index, total_sequences) for index, sequence in enumerate(all_sequences)}
+    for sequence, shot, render_path in renders:
+        if render_path:
+            reformat_node = create_read_crop_and_reformat_node(sequence, shot, render_path, colors[sequence])
+            if reformat_node:
+                all_reformat_nodes.append(reformat_node)
+        else:
+            print(f"No render found for {sequence} {shot}")
     
     if all_reformat_nodes:
         contact_sheet = create_contact_sheet_auto(all_reformat_nodes)
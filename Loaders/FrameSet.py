@@ -0,0 +1,96 @@
+# FrameSet.py v1.0
+#
+# Frame-range engine for rendered image sequences.
+# A sequence is matched with one precompiled pattern (cached per prefix/extension), the
+# directory listing is walked once in sorted order and the frames are stored as
+# run-length (first, last) runs. Min/max, frame count and missing frames all come from
+# the runs, so gaps can be reported without scanning the directory again.
+#
+# Usage:
+#   pattern = FrameSet.sequence_pattern("pp_FILM_SQ0010_SH0010_comp_v003", ".exr")
+#   frame_set = FrameSet.scan_frames(file_names, pattern)
+#   frame_set.first, frame_set.last, frame_set.gaps()
+
+import re
+from functools import lru_cache
+
+ANY_EXR_PATTERN = re.compile(r'(\d+)\.exr$')  # Frame number of any EXR frame file
+
+class FrameSet(object):
+    def __init__(self, runs=None):
+        self.runs = [tuple(run) for run in runs or []]
+
+    @property
+    def first(self):
+        return self.runs[0][0] if self.runs else None
+
+    @property
+    def last(self):
+        return self.runs[-1][1] if self.runs else None
+
+    def __len__(self):
+        return sum(last - first + 1 for first, last in self.runs)
+
+    def __bool__(self):
+        return bool(self.runs)
+
+    def __eq__(self, other):
+        return isinstance(other, FrameSet) and self.runs == other.runs
+
+    def __repr__(self):
+        return f"FrameSet({self})"
+
+    def __str__(self):
+        return format_runs(self.runs)
+
+    def range(self):
+        """Return (first, last), or (None, None) for an empty set."""
+        return self.first, self.last
+
+    def gaps(self):
+        """Return the missing frames between first and last as (first, last) runs."""
+        return [(previous[1] + 1, current[0] - 1) for previous, current in zip(self.runs, self.runs[1:])]
+
+    def missing_count(self):
+        return sum(last - first + 1 for first, last in self.gaps())
+
+def format_runs(runs):
+    """Format runs as Nuke-style frame ranges, e.g. '1001-1040,1045-1100'."""
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in runs)
+
+@lru_cache(maxsize=256)
+def sequence_pattern(prefix, extension=".exr"):
+    """Return the compiled pattern for prefix.<frame><extension>, compiled once per sequence."""
+    return re.compile(re.escape(prefix) + r'\.(\d+)' + re.escape(extension) + '$')
+
+def runs_from_frames(frames):
+    """Collapse an ascending list of frame numbers into (first, last) runs."""
+    runs = []
+    for frame in frames:
+        if runs and frame <= runs[-1][1] + 1:
+            if frame > runs[-1][1]:
+                runs[-1][1] = frame
+        else:
+            runs.append([frame, frame])
+    return [tuple(run) for run in runs]
+
+def scan_frames(names, pattern=ANY_EXR_PATTERN):
+    """Build a FrameSet from file names in a single pass.
+
+    names are expected sorted (as RenderIndex listings are), which keeps zero-padded
+    frames in order; frames are only re-sorted if the padding is inconsistent.
+    pattern must capture the frame number in its first group.
+    """
+    frames = []
+    in_order = True
+    search = pattern.search
+    for name in names:
+        match = search(name)
+        if match:
+            frame = int(match.group(1))
+            if frames and frame < frames[-1]:
+                in_order = False
+            frames.append(frame)
+    if not in_order:
+        frames.sort()
+    return FrameSet(runs_from_frames(frames))
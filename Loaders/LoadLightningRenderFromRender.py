@@ -10,6 +10,9 @@
 import os
 import re
 import nuke
+import RenderIndex
+import FrameSet
+import LoaderInstrumentation
 
 # User customizable variables
 NODE_SPACING_X = 280  # Horizontal spacing between node groups
@@ -71,37 +74,11 @@ def arrange_nodes(nodes, start_x, start_y):
         node.setXYpos(int(node_x), int(node_y))
 
 def find_latest_version(path):
-    versions = [d for d in os.listdir(path) if d.startswith('v') and os.path.isdir(os.path.join(path, d))]
-    return max(versions) if versions else None
+    return RenderIndex.get_render_index().latest_version(path)
 
 def find_all_render_layers(shot_path):
     print_debug(f"Finding all render layers in: {shot_path}")
-    render_layers = {}
-    
-    version_folders = [d for d in os.listdir(shot_path) if d.startswith('v') and os.path.isdir(os.path.join(shot_path, d))]
-    version_folders.sort(reverse=True)
-    
-    for version in version_folders:
-        version_path = os.path.join(shot_path, version)
-        for layer in os.listdir(version_path):
-            layer_path = os.path.join(version_path, layer)
-            if os.path.isdir(layer_path):
-                render_files = [f for f in os.listdir(layer_path) if f.endswith('.exr')]
-                if render_files and layer not in render_layers:
-                    render_layers[layer] = {"version": version, "file": render_files[0], "path": layer_path}
-    
-    if not render_layers:
-        for root, dirs, files in os.walk(shot_path):
-            for dir in dirs:
-                if dir.startswith("exr."):
-                    layer_name = dir.split(".")[-1]
-                    layer_path = os.path.join(root, dir)
-                    version = find_latest_version(layer_path)
-                    if version:
-                        version_path = os.path.join(layer_path, version)
-                        render_files = [f for f in os.listdir(version_path) if f.endswith('.exr')]
-                        if render_files:
-                            render_layers[layer_name] = {"version": version, "file": render_files[0], "path": version_path}
+    render_layers = RenderIndex.get_render_index().render_layers(shot_path)
     
     print_debug(f"Found render layers: {render_layers}")
     return render_layers
@@ -130,8 +107,10 @@ def create_crypto_setup(read_node, selected_node):
 
 def load_latest_renders(shot_path, seq_num, shot_num, start_x, start_y, selected_node):
     print_debug(f"Loading latest renders from: {shot_path}")
-    render_layers = find_all_render_layers(shot_path)
+    with LoaderInstrumentation.phase("discovery"):
+        render_layers = find_all_render_layers(shot_path)
     frame_ranges = {}
+    missing_frames = {}
     created_nodes = []
 
     for layer_name, render_info in render_layers.items():
@@ -142,9 +121,9 @@ def load_latest_renders(shot_path, seq_num, shot_num, start_x, start_y, selected
         read_node = nuke.createNode("Read")
         read_node["file"].setValue(render_path.replace(latest_render.split(".")[-2], "######"))
         
-        frame_files = [f for f in os.listdir(os.path.dirname(render_path)) if f.endswith('.exr')]
-        frame_numbers = [int(re.search(r'(\d+)\.exr$', f).group(1)) for f in frame_files]
-        first_frame, last_frame = min(frame_numbers), max(frame_numbers)
+        with LoaderInstrumentation.phase("discovery"):
+            frame_set = RenderIndex.get_render_index().frame_set(render_info["path"])
+        first_frame, last_frame = frame_set.range()
         
         read_node["first"].setValue(first_frame)
         read_node["last"].setValue(last_frame)
@@ -154,6 +133,8 @@ def load_latest_renders(shot_path, seq_num, shot_num, start_x, start_y, selected
         read_node["label"].setValue(f"{layer_name}\n(v{version.split('v')[1]})")
         
         frame_ranges[layer_name] = (first_frame, last_frame)
+        if frame_set.gaps():
+            missing_frames[layer_name] = frame_set.gaps()
         created_nodes.append(read_node)
         print_debug(f"Created Read node for {layer_name}")
 
@@ -173,7 +154,7 @@ def load_latest_renders(shot_path, seq_num, shot_num, start_x, start_y, selected
             layer_backdrops.append(backdrop)
 
     print_debug(f"Total created nodes: {len(created_nodes)}")
-    return created_nodes, frame_ranges
+    return created_nodes, frame_ranges, missing_frames
 
 def check_frame_range_mismatch(frame_ranges):
     print_debug("Checking frame range mismatches")
@@ -192,6 +173,12 @@ def check_frame_range_mismatch(frame_ranges):
     else:
         return f"All layers have the same frame range: {reference_range[0]}-{reference_range[1]}"
 
+def check_missing_frames(missing_frames):
+    print_debug("Checking missing frames")
+    if not missing_frames:
+        return "No missing frames."
+    return "Missing frames detected:\n" + "\n".join(f"{layer}: {FrameSet.format_runs(gaps)}" for layer, gaps in missing_frames.items())
+
 def get_seq_shot_from_read_node(node):
     file_path = node['file'].value()
     match = re.search(r'SQ(\d+)/SH(\d+)', file_path)
@@ -199,6 +186,7 @@ def get_seq_shot_from_read_node(node):
         return match.group(1), match.group(2)
     return None, None
 
+@LoaderInstrumentation.instrumented("LoadLightningRenderFromRender")
 def find_latest_renders_and_setup_crypto():
     print_debug("Starting find_latest_renders_and_setup_crypto function")
     
@@ -228,16 +216,17 @@ def find_latest_renders_and_setup_crypto():
     if seq_num and shot_num:
         shot_path = f"Y:/20105_Pysna_film/out/FILM/SQ{seq_num}/SH{shot_num}/lighting/render/"
         print_debug(f"Shot path: {shot_path}")
-        if os.path.exists(shot_path):
-            created_nodes, frame_ranges = load_latest_renders(shot_path, seq_num, shot_num, start_x, start_y, selected_node)
+        if RenderIndex.get_render_index(refresh=True).is_dir(shot_path):
+            created_nodes, frame_ranges, missing_frames = load_latest_renders(shot_path, seq_num, shot_num, start_x, start_y, selected_node)
             if created_nodes:
                 loaded_layers = [f"{node['label'].value().split('(')[0].strip()} ({node['label'].value().split('(')[1]}" 
                                  for node in created_nodes if 'Read' in node.name()]
                 layers_message = "Loaded layers:\n" + "\n".join(loaded_layers)
                 
                 mismatch_message = check_frame_range_mismatch(frame_ranges)
+                missing_message = check_missing_frames(missing_frames)
                 
-                full_message = f"Loaded render layers for SQ{seq_num} SH{shot_num}\n\n{layers_message}\n\n{mismatch_message}"
+                full_message = f"Loaded render layers for SQ{seq_num} SH{shot_num}\n\n{layers_message}\n\n{mismatch_message}\n{missing_message}"
                 
                 print_debug(full_message)
                 if nuke.GUI:
@@ -256,4 +245,5 @@ def find_latest_renders_and_setup_crypto():
             nuke.message("Could not determine sequence and shot numbers. Please select a Read node or ensure the script name contains SQ and SH information.")
 
 # Run the script
-find_latest_renders_and_setup_crypto()
+if __name__ == "__main__":
+    find_latest_renders_and_setup_crypto()
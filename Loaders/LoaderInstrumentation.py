@@ -0,0 +1,284 @@
+# LoaderInstrumentation.py v1.0
+#
+# Opt-in filesystem instrumentation for the loaders.
+# While a loader runs, the os calls used to look at the render share (scandir, listdir,
+# stat, exists, isdir, isfile, walk) are wrapped and timed. At the end of the run a report
+# with call counts by type, cumulative latency, the slowest paths and the time split
+# between discovery and node creation is printed in the Script Editor and written as JSON
+# next to the current script (e.g. FILM_SQ0010_SH0010_comp_v003.SequenceLoader.json).
+#
+# Loaders mark their discovery blocks with phase("discovery"). Time spent in nuke dialogs
+# (message, getInput, choice, ask) is reported as "dialogs", and the rest of the run as
+# "nodes", i.e. node creation and layout.
+#
+# Usage (Script Editor):
+#   import LoaderInstrumentation
+#   LoaderInstrumentation.ENABLE_INSTRUMENTATION = True
+#   ...run a loader...
+#
+# In a loader:
+#   @LoaderInstrumentation.instrumented("SequenceLoader")
+#   def load_sequence_and_create_contact_sheet():
+#       with LoaderInstrumentation.phase("discovery"):
+#           renders = discover_renders(sequences, task_type)
+#       ...create nodes...
+#
+# The wrappers are installed on the os module for the duration of the run only, so calls
+# made by other threads during that time are counted too.
+
+import functools
+import json
+import os
+import threading
+import time
+import nuke
+
+# User variables
+ENABLE_INSTRUMENTATION = False  # Instrument loader runs and write a report for each
+SLOWEST_PATHS = 10  # Number of slowest paths listed in the report
+REPORT_FOLDER = os.path.join(os.path.expanduser("~"), ".nuke", "cache", "loader_reports")  # Used for untitled scripts
+
+INSTRUMENTED_CALLS = [
+    (os, "scandir"),
+    (os, "listdir"),
+    (os, "stat"),
+    (os, "walk"),
+    (os.path, "exists"),
+    (os.path, "isdir"),
+    (os.path, "isfile"),
+]
+INSTRUMENTED_DIALOGS = ["message", "getInput", "choice", "ask"]
+
+_active_run = None
+
+class LoaderRun(object):
+    """Collects the filesystem calls and phase timings of one loader run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = {}  # call type -> [count, seconds, failed]
+        self.paths = {}  # path -> [count, seconds]
+        self.phases = {}  # phase name -> seconds (exclusive of nested phases)
+        self.total = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phase_stack = []
+        self._originals = []
+        self._start = None
+
+    def start(self):
+        for module, call in INSTRUMENTED_CALLS:
+            original = getattr(module, call)
+            self._originals.append((module, call, original))
+            setattr(module, call, self._wrap(call, original))
+        for dialog in INSTRUMENTED_DIALOGS:
+            original = getattr(nuke, dialog, None)
+            if original is not None:
+                self._originals.append((nuke, dialog, original))
+                setattr(nuke, dialog, self._wrap_dialog(original))
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.total = time.perf_counter() - self._start
+        for module, call, original in reversed(self._originals):
+            setattr(module, call, original)
+        self._originals = []
+
+    def _wrap(self, call, original):
+        run = self
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            # Calls made inside another instrumented call (isdir -> stat, walk -> scandir) are not counted again
+            if getattr(run._local, "depth", 0):
+                return original(*args, **kwargs)
+            path = args[0] if args else kwargs.get("path", ".")
+            run._local.depth = 1
+            start = time.perf_counter()
+            try:
+                result = original(*args, **kwargs)
+            except OSError:
+                run.record(call, path, time.perf_counter() - start, failed=True)
+                raise
+            finally:
+                run._local.depth = 0
+            if call in ("scandir", "walk"):
+                return _TimedIterator(run, call, path, result, time.perf_counter() - start)
+            run.record(call, path, time.perf_counter() - start)
+            return result
+        return timed
+
+    def _wrap_dialog(self, original):
+        run = self
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            run.enter_phase("dialogs")
+            try:
+                return original(*args, **kwargs)
+            finally:
+                run.exit_phase()
+        return timed
+
+    def record(self, call, path, seconds, failed=False):
+        path = os.fspath(path) if not isinstance(path, int) else str(path)
+        with self._lock:
+            entry = self.calls.setdefault(call, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            if failed:
+                entry[2] += 1
+            entry = self.paths.setdefault(path, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def enter_phase(self, name):
+        self._phase_stack.append([name, time.perf_counter(), 0.0])
+
+    def exit_phase(self):
+        name, start, nested = self._phase_stack.pop()
+        elapsed = time.perf_counter() - start
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+        if self._phase_stack:
+            self._phase_stack[-1][2] += elapsed
+
+    def report(self):
+        slowest = sorted(self.paths.items(), key=lambda item: -item[1][1])[:SLOWEST_PATHS]
+        phases = {name: round(seconds, 4) for name, seconds in self.phases.items()}
+        phases["nodes"] = round(max(0.0, self.total - sum(self.phases.values())), 4)
+        return {
+            "loader": self.name,
+            "script": nuke.root().name(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_seconds": round(self.total, 4),
+            "phases": phases,
+            "filesystem": {
+                "calls": sum(entry[0] for entry in self.calls.values()),
+                "seconds": round(sum(entry[1] for entry in self.calls.values()), 4),
+                "by_type": {call: {"calls": count, "seconds": round(seconds, 4), "failed": failed}
+                            for call, (count, seconds, failed) in sorted(self.calls.items())},
+                "slowest_paths": [{"path": path, "calls": count, "seconds": round(seconds, 4)}
+                                  for path, (count, seconds) in slowest],
+            },
+        }
+
+class _TimedIterator(object):
+    """Wraps the iterator returned by scandir/walk so the time spent iterating it is counted too."""
+
+    def __init__(self, run, call, path, iterator, seconds):
+        self._run = run
+        self._call = call
+        self._path = path
+        self._iterator = iterator
+        self._seconds = seconds
+        self._recorded = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        self._run._local.depth = 1
+        try:
+            item = next(self._iterator)
+        except StopIteration:
+            self._seconds += time.perf_counter() - start
+            self._finish()
+            raise
+        finally:
+            self._run._local.depth = 0
+        self._seconds += time.perf_counter() - start
+        return item
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if hasattr(self._iterator, "close"):
+            self._iterator.close()
+        self._finish()
+
+    def _finish(self):
+        if not self._recorded:
+            self._recorded = True
+            self._run.record(self._call, self._path, self._seconds)
+
+    def __del__(self):
+        self._finish()
+
+class _Phase(object):
+    def __init__(self, name):
+        self.name = name
+        self.run = None
+
+    def __enter__(self):
+        self.run = _active_run
+        if self.run is not None:
+            self.run.enter_phase(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.run is not None:
+            self.run.exit_phase()
+
+def phase(name):
+    """Time a block of the current run under name (e.g. "discovery"). Does nothing when not instrumented."""
+    return _Phase(name)
+
+def report_path(loader_name):
+    script_name = nuke.root().name()
+    if script_name and script_name != "Root":
+        return f"{os.path.splitext(script_name)[0]}.{loader_name}.json"
+    return os.path.join(REPORT_FOLDER, f"{loader_name}.json")
+
+def format_report(report):
+    filesystem = report["filesystem"]
+    lines = [f"{report['loader']}: {report['total_seconds']:.2f}s total, "
+             + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in report["phases"].items())]
+    lines.append(f"Filesystem: {filesystem['calls']} calls, {filesystem['seconds']:.2f}s")
+    for call, entry in filesystem["by_type"].items():
+        failed = f" ({entry['failed']} failed)" if entry["failed"] else ""
+        lines.append(f"  {call}: {entry['calls']} calls{failed}, {entry['seconds']:.3f}s")
+    if filesystem["slowest_paths"]:
+        lines.append("Slowest paths:")
+        for entry in filesystem["slowest_paths"]:
+            lines.append(f"  {entry['seconds']:.3f}s  {entry['calls']}x  {entry['path']}")
+    return "\n".join(lines)
+
+def write_report(report, path):
+    try:
+        folder = os.path.dirname(path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        return True
+    except OSError as e:
+        print(f"Could not write loader report {path}: {str(e)}")
+        return False
+
+def instrumented(loader_name):
+    """Decorator for a loader entry point: instruments the whole call when ENABLE_INSTRUMENTATION is set."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            global _active_run
+            if not ENABLE_INSTRUMENTATION or _active_run is not None:
+                return function(*args, **kwargs)
+            run = _active_run = LoaderRun(loader_name)
+            run.start()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                run.stop()
+                _active_run = None
+                report = run.report()
+                path = report_path(loader_name)
+                print(format_report(report))
+                if write_report(report, path):
+                    print(f"Loader report written to {path}")
+        return wrapper
+    return decorator
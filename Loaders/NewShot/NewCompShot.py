@@ -13,6 +13,9 @@ import nuke
 import os
 import re
 import nukescripts
+import RenderIndex
+import FrameSet
+import LoaderInstrumentation
 
 
 def debug_print(message):
@@ -120,45 +123,21 @@ def arrange_nodes(nodes):
         node.setXYpos(start_x + i * spacing, start_y)
 
 def find_latest_version(path):
-    versions = [d for d in os.listdir(path) if d.startswith('v') and os.path.isdir(os.path.join(path, d))]
-    return max(versions) if versions else None
+    return RenderIndex.get_render_index().latest_version(path)
 
 def find_all_render_layers(shot_path):
     print_step(f"Finding render layers in: {shot_path}")
-    render_layers = {}
-    
-    version_folders = [d for d in os.listdir(shot_path) if d.startswith('v') and os.path.isdir(os.path.join(shot_path, d))]
-    version_folders.sort(reverse=True)
-    
-    for version in version_folders:
-        version_path = os.path.join(shot_path, version)
-        for layer in os.listdir(version_path):
-            layer_path = os.path.join(version_path, layer)
-            if os.path.isdir(layer_path):
-                render_files = [f for f in os.listdir(layer_path) if f.endswith('.exr')]
-                if render_files and layer not in render_layers:
-                    render_layers[layer] = {"version": version, "file": render_files[0], "path": layer_path}
-    
-    if not render_layers:
-        for root, dirs, files in os.walk(shot_path):
-            for dir in dirs:
-                if dir.startswith("exr."):
-                    layer_name = dir.split(".")[-1]
-                    layer_path = os.path.join(root, dir)
-                    version = find_latest_version(layer_path)
-                    if version:
-                        version_path = os.path.join(layer_path, version)
-                        render_files = [f for f in os.listdir(version_path) if f.endswith('.exr')]
-                        if render_files:
-                            render_layers[layer_name] = {"version": version, "file": render_files[0], "path": version_path}
+    render_layers = RenderIndex.get_render_index().render_layers(shot_path)
     
     print(f"Found {len(render_layers)} render layers")
     return render_layers
 
 def load_latest_renders(shot_path, seq_num, shot_num):
     print_step(f"Loading latest renders from: {shot_path}")
-    render_layers = find_all_render_layers(shot_path)
+    with LoaderInstrumentation.phase("discovery"):
+        render_layers = find_all_render_layers(shot_path)
     frame_ranges = {}
+    missing_frames = {}
     created_nodes = []
 
     for layer_name, render_info in render_layers.items():
@@ -169,9 +148,9 @@ def load_latest_renders(shot_path, seq_num, shot_num):
         read_node = nuke.createNode("Read")
         read_node["file"].setValue(render_path.replace(latest_render.split(".")[-2], "######"))
         
-        frame_files = [f for f in os.listdir(os.path.dirname(render_path)) if f.endswith('.exr')]
-        frame_numbers = [int(re.search(r'(\d+)\.exr$', f).group(1)) for f in frame_files]
-        first_frame, last_frame = min(frame_numbers), max(frame_numbers)
+        with LoaderInstrumentation.phase("discovery"):
+            frame_set = RenderIndex.get_render_index().frame_set(render_info["path"])
+        first_frame, last_frame = frame_set.range()
         
         read_node["first"].setValue(first_frame)
         read_node["last"].setValue(last_frame)
@@ -181,6 +160,8 @@ def load_latest_renders(shot_path, seq_num, shot_num):
         read_node["label"].setValue(f"{layer_name}\n(v{version.split('v')[1]})")
         
         frame_ranges[layer_name] = (first_frame, last_frame)
+        if frame_set.gaps():
+            missing_frames[layer_name] = frame_set.gaps()
         created_nodes.append(read_node)
         print(f"Created Read node for {layer_name}")
 
@@ -196,6 +177,8 @@ def load_latest_renders(shot_path, seq_num, shot_num):
     for node, backdrop in zip(created_nodes, layer_backdrops):
         node.setXYpos(backdrop.xpos() + 50, backdrop.ypos() + 50)
 
+    for layer_name, gaps in missing_frames.items():
+        print(f"Missing frames in {layer_name}: {FrameSet.format_runs(gaps)}")
     print(f"Total created nodes: {len(created_nodes)}")
     return created_nodes, frame_ranges
 
@@ -225,15 +208,15 @@ def get_shot_info():
         return None, None
 
 def get_latest_camera_file(base_path, sequence, shot):
-    camera_path = os.path.join(base_path, sequence, shot, "animation", "camera")
-    camera_path = camera_path.replace('\\', '/')
+    index = RenderIndex.get_render_index(base_path)
+    camera_path = index.task_path(sequence, shot, "animation", "camera")
     debug_print(f"Searching for camera files in: {camera_path}")
     
-    if not os.path.exists(camera_path):
+    if not index.is_dir(camera_path):
         debug_print(f"Camera path does not exist: {camera_path}")
         return None
     
-    camera_files = [f for f in os.listdir(camera_path) if f.endswith(".abc") and "anim.cam" in f]
+    camera_files = [f for f in index.files(camera_path, ".abc") if "anim.cam" in f]
     debug_print(f"Found camera files: {camera_files}")
     
     if not camera_files:
@@ -276,7 +259,8 @@ def load_or_update_camera():
         nuke.message("Unable to determine sequence and shot numbers from the script name.")
         return
     
-    latest_camera_file = get_latest_camera_file(base_path, sequence, shot)
+    with LoaderInstrumentation.phase("discovery"):
+        latest_camera_file = get_latest_camera_file(base_path, sequence, shot)
     if not latest_camera_file:
         nuke.message(f"No camera file found for {sequence} {shot}.")
         return
@@ -321,6 +305,7 @@ def get_backdrop_coordinates(label_text):
     print(f"No backdrop node with '{label_text}' in the label found.")
     return None
 
+@LoaderInstrumentation.instrumented("NewCompShot")
 def create_new_comp_shot():
     print_step("Creating new composition shot")
     
@@ -333,7 +318,7 @@ def create_new_comp_shot():
     sequence, shot = get_shot_info()
     if sequence and shot:
         shot_path = f"Y:/20105_Pysna_film/out/FILM/{sequence}/{shot}/lighting/render/"
-        if os.path.exists(shot_path):
+        if RenderIndex.get_render_index(refresh=True).is_dir(shot_path):
             created_nodes, frame_ranges = load_latest_renders(shot_path, sequence[2:], shot[2:])
         else:
             print(f"Shot path does not exist: {shot_path}")
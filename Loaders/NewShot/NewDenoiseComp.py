@@ -1,6 +1,7 @@
 import nuke
 import os
 import re
+import SpatialIndex
 from collections import Counter
 from PySide2 import QtWidgets
 
@@ -58,12 +59,6 @@ def round_value(value):
         return round(value, 2)
     return value
 
-def is_node_in_backdrop(node, backdrop):
-    node_x, node_y = node.xpos(), node.ypos()
-    bd_x, bd_y = backdrop.xpos(), backdrop.ypos()
-    bd_r, bd_t = bd_x + backdrop['bdwidth'].value(), bd_y + backdrop['bdheight'].value()
-    return bd_x <= node_x <= bd_r and bd_y <= node_y <= bd_t
-
 def find_wrong_zdefocus_nodes():
     defocus_nodes = [n for n in nuke.allNodes() if 'PxF_ZDefocus' in n.name() and 'Controller' not in n.name()]
     
@@ -74,6 +69,8 @@ def find_wrong_zdefocus_nodes():
     print(f"Analyzing {len(defocus_nodes)} PxF_ZDefocusHERO nodes for wrong values:")
     
     purple_backdrops = [n for n in nuke.allNodes('BackdropNode') if n['tile_color'].value() == 2390460672]
+    index = SpatialIndex.SpatialIndex(purple_backdrops + defocus_nodes)
+    in_purple_backdrop = {node.name(): bool(index.backdrops_containing(node, fully=False)) for node in defocus_nodes}
     knobs_to_compare = ['fStop', 'focalDistance', 'focalLength', 'filmBack']
     
     wrong_nodes = {}
@@ -84,7 +81,7 @@ def find_wrong_zdefocus_nodes():
         for node in defocus_nodes:
             if knob in node.knobs():
                 value = round_value(node[knob].value())
-                node_in_purple = any(is_node_in_backdrop(node, bd) for bd in purple_backdrops)
+                node_in_purple = in_purple_backdrop[node.name()]
                 if value not in knob_values:
                     knob_values[value] = []
                 knob_values[value].append((node.name(), node_in_purple))
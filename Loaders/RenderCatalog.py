@@ -0,0 +1,134 @@
+# RenderCatalog.py v1.1
+#
+# Persistent on-disk catalog for RenderIndex.
+# Directory listings and frame sets of the published render tree are stored in a
+# local SQLite database together with the directory's mtime. A later Nuke session only
+# has to stat a directory: if its mtime is unchanged the stored listing is reused, and
+# only directories whose mtime changed are listed again on the network share.
+# Every entry is committed as it is stored, so several sessions can share the catalog;
+# a catalog that is locked or damaged is skipped for the rest of the session (with one
+# warning) and never stops a loader.
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+
+# User variables
+CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".nuke", "cache", "render_catalog.sqlite")
+LOCK_TIMEOUT = 1.0  # Seconds to wait for another Nuke session writing the catalog before skipping it
+
+_catalogs = {}
+
+class RenderCatalog(object):
+    def __init__(self, path=None):
+        path = path or CATALOG_PATH
+        self.path = path
+        self._lock = threading.Lock()
+        self.disabled = False  # Set after an error: the catalog is then skipped for the session
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        self._connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            "path TEXT PRIMARY KEY, mtime REAL, dirs TEXT, files TEXT)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS frame_sets ("
+            "path TEXT, pattern TEXT, mtime REAL, runs TEXT, "
+            "PRIMARY KEY (path, pattern))")
+        self._connection.commit()
+
+    def load_listing(self, path, mtime):
+        """Return the stored (dirs, files) of path if it was scanned at this mtime, else None."""
+        row = self._fetch("SELECT dirs, files FROM listings WHERE path = ? AND mtime = ?", (path, mtime))
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def store_listing(self, path, mtime, listing):
+        dirs, files = listing
+        self._store("INSERT OR REPLACE INTO listings (path, mtime, dirs, files) VALUES (?, ?, ?, ?)",
+                    (path, mtime, json.dumps(dirs), json.dumps(files)))
+
+    def load_frame_runs(self, path, pattern, mtime):
+        """Return the stored [(first, last), ...] runs for path and pattern if still valid, else None."""
+        row = self._fetch("SELECT runs FROM frame_sets WHERE path = ? AND pattern = ? AND mtime = ?",
+                          (path, pattern, mtime))
+        return [tuple(run) for run in json.loads(row[0])] if row is not None else None
+
+    def store_frame_runs(self, path, pattern, mtime, runs):
+        self._store("INSERT OR REPLACE INTO frame_sets (path, pattern, mtime, runs) VALUES (?, ?, ?, ?)",
+                    (path, pattern, mtime, json.dumps(runs)))
+
+    def _fetch(self, query, parameters):
+        # A locked or damaged catalog only costs the cache hit; the caller lists the directory
+        if self.disabled:
+            return None
+        try:
+            with self._lock:
+                return self._connection.execute(query, parameters).fetchone()
+        except sqlite3.Error as e:
+            self._warn(e)
+            return None
+
+    def _store(self, query, parameters):
+        # Committed right away, so no write transaction stays open for other Nuke sessions to wait on
+        if self.disabled:
+            return
+        with self._lock:
+            try:
+                self._connection.execute(query, parameters)
+                self._connection.commit()
+            except sqlite3.Error as e:
+                try:
+                    self._connection.rollback()
+                except sqlite3.Error:
+                    pass
+                self._warn(e)
+
+    def _warn(self, error):
+        # Waiting LOCK_TIMEOUT on every directory would stall the loader, so give up on the catalog
+        if not self.disabled:
+            self.disabled = True
+            print(f"Render catalog {self.path} not used for this session: {str(error)}")
+
+    def flush(self):
+        """Write pending entries to disk."""
+        with self._lock:
+            try:
+                self._connection.commit()
+            except sqlite3.Error as e:
+                self._warn(e)
+
+    def clear(self):
+        """Drop every stored entry, forcing a full rescan."""
+        with self._lock:
+            self._connection.execute("DELETE FROM listings")
+            self._connection.execute("DELETE FROM frame_sets")
+            self._connection.commit()
+
+def get_catalog(path=None):
+    """Return the shared catalog stored at path (CATALOG_PATH by default), or None if it cannot be opened."""
+    path = path or CATALOG_PATH
+    catalog = _catalogs.get(path)
+    if catalog is None:
+        try:
+            catalog = RenderCatalog(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Render catalog disabled, could not open {path}: {str(e)}")
+            return None
+        _catalogs[path] = catalog
+    return catalog
+
+@atexit.register
+def _flush_all():
+    for catalog in _catalogs.values():
+        try:
+            catalog.flush()
+        except sqlite3.Error:
+            pass
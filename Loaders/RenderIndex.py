@@ -0,0 +1,324 @@
+# RenderIndex.py v1.0
+#
+# Shared in-memory index of the published render tree under out/FILM.
+# Every directory is listed at most once with os.scandir and remembered, so the
+# loaders in this folder can ask for sequences, shots, task versions, lighting layers,
+# frame ranges and preview movies without going back to the network share.
+# With USE_RENDER_CATALOG the listings are also kept in the on-disk RenderCatalog, so a
+# new session only re-lists directories whose mtime changed since they were stored.
+# Missing directories are remembered for MISSING_TTL seconds across loader runs, and a
+# directory absent from an already known parent listing is never stat'ed at all.
+# The index is safe to update from a RenderWatcher thread while loaders query it.
+#
+# Usage:
+#   import RenderIndex
+#   index = RenderIndex.get_render_index()
+#   render_path = index.task_path("SQ0010", "SH0010", "compositing")
+#   version = index.latest_version(render_path)
+
+import os
+import re
+import threading
+import time
+import RenderCatalog
+import FrameSet
+
+# User variables
+FILM_ROOT = "Y:/20105_Pysna_film/out/FILM"
+USE_RENDER_CATALOG = True  # Reuse listings from the on-disk catalog when the directory mtime is unchanged
+MISSING_TTL = 300  # Seconds a missing directory is remembered before it is probed again
+LAYER_SEARCH_DEPTH = 4  # How many folder levels below the render folder are searched for exr.<layer> folders
+VERSION_PATTERN = re.compile(r'^v(\d+)')
+
+_indexes = {}
+
+def join_path(*parts):
+    """Join path parts with forward slashes, the way Nuke expects file paths."""
+    return "/".join(part.replace("\\", "/").rstrip("/") for part in parts if part)
+
+def normalize_path(path):
+    return path.replace("\\", "/").rstrip("/")
+
+def version_number(name):
+    """Return the numeric part of a version folder name, -1 if it has none."""
+    match = VERSION_PATTERN.match(name)
+    return int(match.group(1)) if match else -1
+
+class RenderIndex(object):
+    def __init__(self, root=None, catalog=None):
+        self.root = normalize_path(root or FILM_ROOT)
+        self.catalog = catalog
+        self.watched = False  # Set by RenderWatcher; a watched index is kept up to date instead of refreshed
+        self._lock = threading.RLock()
+        self._listings = {}
+        self._mtimes = {}
+        self._missing = {}  # path -> time it was found missing
+        self._frame_sets = {}
+        self._render_layers = {}
+
+    # Filesystem access -----------------------------------------------------
+
+    def list_dir(self, path):
+        """Return sorted (dirs, files) of path, scanning it at most once."""
+        path = normalize_path(path)
+        listing = self._listings.get(path)
+        if listing is not None:
+            return listing
+        if self._is_known_missing(path):
+            return self._store_listing(path, ([], []))
+
+        if self.catalog is not None:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                self._mark_missing(path)
+                return self._store_listing(path, ([], []))
+            listing = self.catalog.load_listing(path, mtime)
+            if listing is None:
+                listing = self._scan_dir(path)
+                if path not in self._missing:
+                    self.catalog.store_listing(path, mtime, listing)
+            return self._store_listing(path, listing, mtime)
+        return self._store_listing(path, self._scan_dir(path))
+
+    def _store_listing(self, path, listing, mtime=None):
+        with self._lock:
+            self._listings[path] = listing
+            if mtime is not None:
+                self._mtimes[path] = mtime
+        return listing
+
+    def _mark_missing(self, path):
+        with self._lock:
+            self._missing[path] = time.time()
+
+    def _scan_dir(self, path):
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(entry.name)
+        except OSError:
+            self._mark_missing(path)
+        dirs.sort()
+        files.sort()
+        return dirs, files
+
+    def _is_known_missing(self, path):
+        """True if path is negatively cached or absent from a known listing above it."""
+        with self._lock:
+            return self._check_missing(path)
+
+    def _check_missing(self, path):
+        missing_since = self._missing.get(path)
+        if missing_since is not None:
+            if time.time() - missing_since < MISSING_TTL:
+                return True
+            del self._missing[path]
+        # Walk up to the nearest folder that is already listed and check the next step down
+        child = path
+        parent = path.rpartition('/')[0]
+        while parent and parent != child:
+            parent_listing = self._listings.get(parent)
+            if parent_listing is not None:
+                if child.rpartition('/')[2] in parent_listing[0]:
+                    return False
+                self._missing[path] = time.time()
+                return True
+            child, parent = parent, parent.rpartition('/')[0]
+        return False
+
+    def is_dir(self, path):
+        """Check that path is a directory, reusing the listing a loader needs next anyway."""
+        self.list_dir(path)
+        return normalize_path(path) not in self._missing
+
+    def refresh(self, path=None):
+        """Forget everything under path (or everything) so it is rescanned on next query.
+
+        A full refresh keeps the negative cache until MISSING_TTL expires; refreshing a
+        specific path also forgets which directories under it were missing.
+        """
+        with self._lock:
+            self._refresh(path)
+
+    def _refresh(self, path):
+        if path is None:
+            self._listings.clear()
+            self._mtimes.clear()
+            now = time.time()
+            self._missing = {p: since for p, since in self._missing.items() if now - since < MISSING_TTL}
+            self._frame_sets.clear()
+            self._render_layers.clear()
+            return
+        path = normalize_path(path)
+        for cache in (self._listings, self._mtimes, self._frame_sets, self._render_layers):
+            for key in [k for k in cache if _is_within(_cache_path(k), path)]:
+                del cache[key]
+        self._missing = {p: since for p, since in self._missing.items() if not _is_within(p, path)}
+
+    def invalidate(self, path):
+        """Forget one directory's listing and what was derived from it, keeping its subfolders.
+
+        Used by RenderWatcher when a single folder changed, e.g. a new version or frame.
+        """
+        path = normalize_path(path)
+        with self._lock:
+            self._listings.pop(path, None)
+            self._mtimes.pop(path, None)
+            for key in [k for k in self._frame_sets if k[0] == path]:
+                del self._frame_sets[key]
+            for key in [k for k in self._render_layers if _is_within(path, k)]:
+                del self._render_layers[key]
+            self._missing = {p: since for p, since in self._missing.items() if not _is_within(p, path)}
+
+    def cached_listing(self, path):
+        """Return the in-memory (dirs, files) of path without touching the filesystem, or None."""
+        return self._listings.get(normalize_path(path))
+
+    def listed_paths(self):
+        """Return the directories currently held in memory."""
+        with self._lock:
+            return list(self._listings)
+
+    def known_mtime(self, path):
+        return self._mtimes.get(normalize_path(path))
+
+    # Tree queries ----------------------------------------------------------
+
+    def sequences(self):
+        dirs, _ = self.list_dir(self.root)
+        return [d for d in dirs if d.startswith('SQ')]
+
+    def shots(self, sequence):
+        dirs, _ = self.list_dir(join_path(self.root, sequence))
+        return [d for d in dirs if d.startswith('SH')]
+
+    def shot_path(self, sequence, shot):
+        return join_path(self.root, sequence, shot)
+
+    def task_path(self, sequence, shot, task, folder='render'):
+        return join_path(self.root, sequence, shot, task, folder)
+
+    def versions(self, path):
+        """Version folders (v001, v002, ...) in path, oldest first."""
+        dirs, _ = self.list_dir(path)
+        return sorted((d for d in dirs if d.startswith('v')), key=lambda d: (version_number(d), d))
+
+    def latest_version(self, path):
+        versions = self.versions(path)
+        return versions[-1] if versions else None
+
+    def files(self, path, suffix=None):
+        _, files = self.list_dir(path)
+        if suffix is None:
+            return list(files)
+        return [f for f in files if f.endswith(suffix)]
+
+    def frame_set(self, path, pattern=FrameSet.ANY_EXR_PATTERN):
+        """Return the FrameSet of the files in path matching pattern (first group = frame)."""
+        path = normalize_path(path)
+        key = (path, pattern.pattern)
+        frame_set = self._frame_sets.get(key)
+        if frame_set is not None:
+            return frame_set
+
+        files = self.files(path)
+        mtime = self._mtimes.get(path)
+        runs = self.catalog.load_frame_runs(path, pattern.pattern, mtime) if mtime is not None else None
+        if runs is not None:
+            frame_set = FrameSet.FrameSet(runs)
+        else:
+            frame_set = FrameSet.scan_frames(files, pattern)
+            if mtime is not None:
+                self.catalog.store_frame_runs(path, pattern.pattern, mtime, frame_set.runs)
+        with self._lock:
+            self._frame_sets[key] = frame_set
+        return frame_set
+
+    def previews(self, sequence, shot, task='compositing'):
+        return self.files(self.task_path(sequence, shot, task, 'preview'), '.mov')
+
+    def latest_preview(self, sequence, shot, task='compositing'):
+        previews = self.previews(sequence, shot, task)
+        if not previews:
+            return None
+        return join_path(self.task_path(sequence, shot, task, 'preview'), max(previews))
+
+    def render_layers(self, shot_path):
+        """Return {layer: {"version", "file", "path"}} for the newest render of every layer.
+
+        Handles both the render/vNNN/layer/ layout and the older exr.layer/vNNN/ layout;
+        the latter is found with find_layer_folders() instead of walking the whole tree.
+        """
+        shot_path = normalize_path(shot_path)
+        render_layers = self._render_layers.get(shot_path)
+        if render_layers is not None:
+            return dict(render_layers)
+
+        render_layers = {}
+        for version in reversed(self.versions(shot_path)):
+            version_path = join_path(shot_path, version)
+            for layer in self.list_dir(version_path)[0]:
+                if layer in render_layers:
+                    continue
+                layer_path = join_path(version_path, layer)
+                render_files = self.files(layer_path, '.exr')
+                if render_files:
+                    render_layers[layer] = {"version": version, "file": render_files[0], "path": layer_path}
+
+        if not render_layers:
+            for folder_path in self.find_layer_folders(shot_path):
+                layer_name = folder_path.rpartition("/")[2].split(".")[-1]
+                version = self.latest_version(folder_path)
+                if version:
+                    version_path = join_path(folder_path, version)
+                    render_files = self.files(version_path, '.exr')
+                    if render_files:
+                        render_layers[layer_name] = {"version": version, "file": render_files[0], "path": version_path}
+
+        with self._lock:
+            self._render_layers[shot_path] = render_layers
+        return dict(render_layers)
+
+    def find_layer_folders(self, path, max_depth=LAYER_SEARCH_DEPTH, prefix="exr."):
+        """Breadth-first search for prefix* layer folders at most max_depth levels below path.
+
+        The search stops at the first level that contains layer folders and never descends
+        into them, so frame folders are not listed. Listings come from the index and are reused.
+        """
+        level = [normalize_path(path)]
+        for _ in range(max_depth):
+            found, next_level = [], []
+            for folder_path in level:
+                for folder in self.list_dir(folder_path)[0]:
+                    (found if folder.startswith(prefix) else next_level).append(join_path(folder_path, folder))
+            if found:
+                return found
+            level = next_level
+        return []
+
+def _is_within(path, folder):
+    return path == folder or path.startswith(folder + "/")
+
+def _cache_path(key):
+    return key[0] if isinstance(key, tuple) else key
+
+def get_render_index(root=None, refresh=False):
+    """Return the index shared by all loaders for root (FILM_ROOT by default).
+
+    refresh drops the in-memory state; with the catalog enabled, unchanged directories
+    are then revalidated by mtime instead of being listed again.
+    """
+    root = normalize_path(root or FILM_ROOT)
+    index = _indexes.get(root)
+    if index is None:
+        catalog = RenderCatalog.get_catalog() if USE_RENDER_CATALOG else None
+        index = _indexes[root] = RenderIndex(root, catalog)
+    elif refresh and not index.watched:
+        index.refresh()
+    return index
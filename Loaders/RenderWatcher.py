@@ -0,0 +1,276 @@
+# RenderWatcher.py v1.1
+#
+# Optional background watcher that keeps a RenderIndex hot while artists publish renders.
+# Every directory the index has listed is watched; when one changes (a new version
+# folder, new frames, a deleted layer) only that directory is invalidated and listed
+# again, and new subfolders are listed right away, so loaders answer from memory.
+#
+# On Linux the watcher uses inotify through ctypes. Everywhere else, or when inotify is
+# unavailable (or WATCHER_MODE = "poll"), it stats the listed directories every
+# POLL_INTERVAL seconds and rescans the ones whose mtime changed.
+# Note that inotify does not see changes made by other machines on SMB/NFS mounts, so
+# use "poll" when the share is mounted on Linux. Directories inotify refuses to watch
+# (e.g. when fs.inotify.max_user_watches is reached) are polled instead, with one warning.
+#
+# Usage:
+#   import RenderWatcher
+#   RenderWatcher.start_watcher()        # watch the shared index of out/FILM
+#   RenderWatcher.stop_watcher()
+#
+# For tests, create RenderWatcher(index) on a temp tree and call check() instead of start().
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import RenderIndex
+
+# User variables
+WATCHER_MODE = "auto"  # "auto" (inotify on Linux, polling elsewhere), "inotify" or "poll"
+POLL_INTERVAL = 30.0  # Seconds between mtime checks in polling mode
+DEBOUNCE = 0.5  # Seconds to wait for a burst of inotify events (e.g. frames being written) to settle
+NEW_FOLDER_DEPTH = 3  # How deep new folders are listed eagerly (version/layer/frames)
+
+# inotify constants from <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+_watchers = {}
+
+class InotifyBackend(object):
+    """Watches directories with Linux inotify and reports the ones that changed."""
+    name = "inotify"
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}  # watch descriptor -> path
+        self._descriptors = {}  # path -> watch descriptor
+        self._polling = PollingBackend(POLL_INTERVAL)  # Directories inotify refused to watch
+        self._last_poll = time.time()
+        self.failed = set()  # Paths inotify_add_watch failed for, polled instead
+
+    def watch(self, path, mtime=None):
+        if path in self._descriptors or self._polling.is_watching(path):
+            return
+        descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if descriptor >= 0:
+            self._paths[descriptor] = path
+            self._descriptors[path] = descriptor
+            return
+        # E.g. fs.inotify.max_user_watches is exhausted: keep the directory up to date by polling
+        error = ctypes.get_errno()
+        if not self.failed:
+            print(f"RenderWatcher: inotify cannot watch {path} ({os.strerror(error)}); "
+                  f"polling such directories every {self._polling.interval:g} s")
+        self.failed.add(path)
+        self._polling.watch(path, mtime)
+
+    def unwatch(self, path):
+        self._polling.unwatch(path)
+        self.failed.discard(path)
+        descriptor = self._descriptors.pop(path, None)
+        if descriptor is not None:
+            self._paths.pop(descriptor, None)
+            self._libc.inotify_rm_watch(self._fd, descriptor)
+
+    def interrupt(self):
+        """Nothing to do: changed() returns after its select timeout."""
+
+    def changed(self, timeout):
+        """Block up to timeout seconds and return the set of directories that changed."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        changed = set()
+        if self.failed and time.time() - self._last_poll >= self._polling.interval:
+            self._last_poll = time.time()
+            changed.update(self._polling.changed(0))
+        if not readable:
+            return changed
+        time.sleep(DEBOUNCE)
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + length
+                path = self._paths.get(descriptor)
+                if path is None:
+                    continue
+                changed.add(path)
+                if mask & IN_IGNORED:
+                    self._paths.pop(descriptor, None)
+                    self._descriptors.pop(path, None)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+class PollingBackend(object):
+    """Stats watched directories and reports the ones whose mtime changed."""
+    name = "poll"
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self._mtimes = {}
+        self._stop = threading.Event()
+
+    def watch(self, path, mtime=None):
+        if path in self._mtimes:
+            return
+        if mtime is None:
+            mtime = _stat_mtime(path)
+        self._mtimes[path] = mtime
+
+    def unwatch(self, path):
+        self._mtimes.pop(path, None)
+
+    def is_watching(self, path):
+        return path in self._mtimes
+
+    def interrupt(self):
+        """Make a waiting changed() return now."""
+        self._stop.set()
+
+    def changed(self, timeout=None):
+        """Wait up to timeout seconds (default POLL_INTERVAL), then return the changed directories."""
+        self._stop.wait(self.interval if timeout is None else timeout)
+        changed = set()
+        for path, mtime in list(self._mtimes.items()):
+            current = _stat_mtime(path)
+            if current != mtime:
+                self._mtimes[path] = current
+                changed.add(path)
+        return changed
+
+    def close(self):
+        self._stop.set()
+
+def _stat_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def create_backend(mode=WATCHER_MODE):
+    if mode in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend()
+        except (OSError, AttributeError) as e:
+            if mode == "inotify":
+                raise
+            print(f"RenderWatcher: inotify unavailable ({str(e)}), falling back to polling")
+    elif mode == "inotify":
+        raise OSError("inotify is only available on Linux")
+    return PollingBackend()
+
+class RenderWatcher(object):
+    def __init__(self, index, mode=WATCHER_MODE):
+        self.index = index
+        self.backend = create_backend(mode)
+        self.updates = 0  # Number of directories rescanned since start
+        self._thread = None
+        self._running = threading.Event()
+
+    def sync_watches(self):
+        """Start watching every directory the index has listed since the last cycle."""
+        for path in self.index.listed_paths():
+            if self.index.is_dir(path):
+                self.backend.watch(path, self.index.known_mtime(path))
+
+    def check(self, timeout=0.0):
+        """Run one watch cycle: wait for changes and update the index. Returns the changed dirs."""
+        self.sync_watches()
+        changed = self.backend.changed(timeout)
+        for path in sorted(changed):
+            self.update_directory(path)
+        return changed
+
+    def update_directory(self, path):
+        """Rescan one changed directory and eagerly list any folders that appeared in it."""
+        old_listing = self.index.cached_listing(path)
+        self.index.invalidate(path)
+        if not self.index.is_dir(path):
+            self.backend.unwatch(path)
+            return
+        new_dirs = self.index.list_dir(path)[0]
+        self.updates += 1
+        if old_listing is not None:
+            for folder in new_dirs:
+                if folder not in old_listing[0]:
+                    self._list_new_folder(RenderIndex.join_path(path, folder), NEW_FOLDER_DEPTH)
+        self.backend.watch(path, self.index.known_mtime(path))
+
+    def _list_new_folder(self, path, depth):
+        dirs = self.index.list_dir(path)[0]
+        self.backend.watch(path, self.index.known_mtime(path))
+        if depth > 1:
+            for folder in dirs:
+                self._list_new_folder(RenderIndex.join_path(path, folder), depth - 1)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.index.watched = True
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="RenderWatcher", daemon=True)
+        self._thread.start()
+        print(f"RenderWatcher started on {self.index.root} ({self.backend.name})")
+
+    def stop(self):
+        self._running.clear()
+        self.index.watched = False
+        if self._thread is None:
+            self.backend.close()
+            return
+        # The thread closes the backend itself once it is out of changed(), so it never
+        # reads an inotify descriptor that was already closed (or reused)
+        self.backend.interrupt()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        timeout = 1.0 if self.backend.name == "inotify" else None
+        try:
+            while self._running.is_set():
+                try:
+                    self.check(timeout)
+                except Exception as e:
+                    print(f"RenderWatcher error: {str(e)}")
+                    time.sleep(1.0)
+        finally:
+            self.backend.close()
+
+def start_watcher(root=None, mode=WATCHER_MODE):
+    """Start (once) a background watcher for the shared index of root and return it."""
+    index = RenderIndex.get_render_index(root)
+    watcher = _watchers.get(index.root)
+    if watcher is None:
+        watcher = _watchers[index.root] = RenderWatcher(index, mode)
+        watcher.sync_watches()
+        watcher.start()
+    return watcher
+
+def stop_watcher(root=None):
+    watcher = _watchers.pop(RenderIndex.normalize_path(root or RenderIndex.FILM_ROOT), None)
+    if watcher is not None:
+        watcher.stop()
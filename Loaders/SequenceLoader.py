@@ -7,12 +7,21 @@
 # The backdrop is 15% smaller, gray, and the entire setup is 500px lower.
 # Each sequence now has its own dimmer color for easier visual distinction.
 # The script always starts by showing the current sequence number from the script name.
+# Render discovery runs on a thread pool; Read nodes are only created on the main thread.
 
 import nuke
 import os
 import re
 import random
 import colorsys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import RenderIndex
+import FrameSet
+import LoaderInstrumentation
+
+# User variables
+DISCOVERY_THREADS = 8  # Number of shots probed on the network share at the same time
 
 def get_current_sequence():
     script_name = nuke.root().name()
@@ -30,33 +39,54 @@ def get_sequence_from_user(current_sequence):
     return sequence
 
 def get_shot_numbers(sequence):
-    return [f"{sequence}_{i:04d}" for i in range(10, 1000, 10)]
+    shots = RenderIndex.get_render_index().shots(f"SQ{sequence}")
+    return [f"{sequence}_{shot[2:]}" for shot in shots]
+
+def get_task_name(task_type):
+    return 'compositing_denoise' if task_type == 'denoise' else 'compositing'
 
 def find_latest_render(sequence, shot, task_type):
-    base_path = f"Y:/20105_Pysna_film/out/FILM/SQ{sequence}/SH{shot}/{'compositing_denoise' if task_type == 'denoise' else 'compositing'}/render/"
-    if not os.path.exists(base_path):
-        return None
-    versions = [d for d in os.listdir(base_path) if d.startswith('v')]
-    return os.path.join(base_path, max(versions, key=lambda x: int(x[1:]))) if versions else None
+    index = RenderIndex.get_render_index()
+    base_path = index.task_path(f"SQ{sequence}", f"SH{shot}", get_task_name(task_type))
+    version = index.latest_version(base_path)
+    return RenderIndex.join_path(base_path, version) if version else None
 
 def find_frame_range(render_path, sequence, shot, version, task_type):
-    file_pattern = f"pp_FILM_SQ{sequence}_SH{shot}_{'compositing_denoise' if task_type == 'denoise' else 'comp'}_{version}.*.exr"
-    files = [f for f in os.listdir(render_path) if re.match(file_pattern.replace('*', '\d+'), f)]
-    if files:
-        frames = [int(re.search(r'\.(\d+)\.', f).group(1)) for f in files]
-        return min(frames), max(frames)
+    file_prefix = f"pp_FILM_SQ{sequence}_SH{shot}_{'compositing_denoise' if task_type == 'denoise' else 'comp'}_{version}"
+    frame_set = RenderIndex.get_render_index().frame_set(render_path, FrameSet.sequence_pattern(file_prefix, ".exr"))
+    if frame_set:
+        if frame_set.gaps():
+            print(f"Missing frames for SQ{sequence} SH{shot}: {FrameSet.format_runs(frame_set.gaps())}")
+        return frame_set.range()
     
     print(f"No frames found for SQ{sequence} SH{shot} in {render_path}")
     return None, None
 
-def create_read_node(sequence, shot, render_path, task_type, color):
-    version = os.path.basename(render_path)
-    file_pattern = f"pp_FILM_SQ{sequence}_SH{shot}_{'compositing_denoise' if task_type == 'denoise' else 'comp'}_{version}.%06d.exr"
-    full_path = os.path.join(render_path, file_pattern)
+def discover_shot(sequence, shot, task_type):
+    """Find the latest render and its frame range for one shot. Safe to run off the main thread."""
+    render_path = find_latest_render(sequence, shot, task_type)
+    if not render_path:
+        if task_type == 'denoise':
+            print(f"No denoise render found for SQ{sequence} SH{shot}")
+        return None
     
+    version = os.path.basename(render_path)
     first_frame, last_frame = find_frame_range(render_path, sequence, shot, version, task_type)
     if first_frame is None or last_frame is None:
         return None
+    return {"sequence": sequence, "shot": shot, "render_path": render_path, "first": first_frame, "last": last_frame}
+
+def discover_renders(sequences, task_type, max_workers=DISCOVERY_THREADS):
+    """Probe every shot of every sequence concurrently, keeping the sequence/shot order."""
+    jobs = [(sequence, shot.split('_')[1]) for sequence in sequences for shot in get_shot_numbers(sequence)]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(executor.map(lambda job: discover_shot(job[0], job[1], task_type), jobs))
+    return [result for result in results if result]
+
+def create_read_node(sequence, shot, render_path, task_type, color, first_frame, last_frame):
+    version = os.path.basename(render_path)
+    file_pattern = f"pp_FILM_SQ{sequence}_SH{shot}_{'compositing_denoise' if task_type == 'denoise' else 'comp'}_{version}.%06d.exr"
+    full_path = os.path.join(render_path, file_pattern)
     
     unique_name = f"Read_SQ{sequence}_SH{shot}_{task_type}_{random.randint(1000, 9999)}"
     
@@ -138,6 +168,7 @@ def generate_color(index, total):
     r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
     return int(r * 255) << 24 | int(g * 255) << 16 | int(b * 255) << 8 | 255
 
+@LoaderInstrumentation.instrumented("SequenceLoader")
 def load_sequence_and_create_contact_sheet():
     write_node = find_write_node()
     if not write_node:
@@ -154,6 +185,7 @@ def load_sequence_and_create_contact_sheet():
     task_type = 'denoise' if is_denoise_script and nuke.choice("Render Selection", "Choose which renders to load:", ["Regular (Comp)", "Denoised"]) == 1 else 'comp'
     
     current_sequence = get_current_sequence()
+    RenderIndex.get_render_index(refresh=True)
     
     while True:
         sequence = get_sequence_from_user(current_sequence)
@@ -163,19 +195,19 @@ def load_sequence_and_create_contact_sheet():
         sequences.append(sequence)
         current_sequence = f"{int(sequence) + 10:04d}"  # Increment for next iteration
     
-    for index, sequence in enumerate(sequences):
-        color = generate_color(index, len(sequences))
-        
-        for shot in get_shot_numbers(sequence):
-            render_path = find_latest_render(sequence, shot.split('_')[1], task_type)
-            if render_path:
-                read_node = create_read_node(sequence, shot.split('_')[1], render_path, task_type, color)
-                if read_node:
-                    text_node = create_text_node(sequence, shot.split('_')[1], task_type, color)
-                    text_node.setInput(0, read_node)
-                    all_read_nodes.append(text_node)
-            elif task_type == 'denoise':
-                print(f"No denoise render found for SQ{sequence} SH{shot.split('_')[1]}")
+    discovery_start = time.perf_counter()
+    with LoaderInstrumentation.phase("discovery"):
+        renders = discover_renders(sequences, task_type)
+    discovery_time = time.perf_counter() - discovery_start
+    
+    build_start = time.perf_counter()
+    colors = {sequence: generate_color(index, len(sequences)) for index, sequence in enumerate(sequences)}
+    for render in renders:
+        sequence, shot = render["sequence"], render["shot"]
+        read_node = create_read_node(sequence, shot, render["render_path"], task_type, colors[sequence], render["first"], render["last"])
+        text_node = create_text_node(sequence, shot, task_type, colors[sequence])
+        text_node.setInput(0, read_node)
+        all_read_nodes.append(text_node)
     
     if all_read_nodes:
         spacing_x, spacing_y, text_offset_y = 250, 250, 107
@@ -190,10 +222,15 @@ def load_sequence_and_create_contact_sheet():
         
         all_nodes = all_read_nodes + [contact_sheet]
         backdrop = create_backdrop(all_nodes, sequences)
-        
-        nuke.message(f"Loaded {len(all_read_nodes)} shots from {len(sequences)} sequences: {', '.join(sequences)}")
+    
+    build_time = time.perf_counter() - build_start
+    timing = f"Discovery: {discovery_time:.2f}s ({DISCOVERY_THREADS} threads), node graph: {build_time:.2f}s"
+    print(timing)
+    
+    if all_read_nodes:
+        nuke.message(f"Loaded {len(all_read_nodes)} shots from {len(sequences)} sequences: {', '.join(sequences)}\n{timing}")
     else:
-        nuke.message("No shots were loaded.")
+        nuke.message(f"No shots were loaded.\n{timing}")
 
 if __name__ == "__main__":
     load_sequence_and_create_contact_sheet()
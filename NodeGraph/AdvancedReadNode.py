@@ -90,13 +90,15 @@ def load_lightning_renders():
         with open(script_path, 'r') as file:
             script_content = file.read()
         
-        # Execute the script content within the correct Nuke context
+        # Execute the script content within the correct Nuke context, as a top-level script so
+        # its 'if __name__ == "__main__":' block runs
         with nuke.Root():
             exec(script_content, {
                 "print_debug": print_debug,
                 "create_crypto_setup": create_crypto_setup,
                 "nuke": nuke,
-                "__file__": script_path
+                "__file__": script_path,
+                "__name__": "__main__"
             })
     except Exception as e:
         nuke.message(f"An unexpected error occurred while loading lightning renders:\n{str(e)}")
@@ -108,10 +110,13 @@ def add_custom_tab(node):
     mt_tab = nuke.Tab_Knob('MT', 'MT')
     node.addKnob(mt_tab)
     
-    open_comp_btn = nuke.PyScript_Knob('open_comp', 'Open Comp File', 'open_comp_file()')
+    # Button scripts run in __main__, so they import this module instead of relying on its globals
+    open_comp_btn = nuke.PyScript_Knob('open_comp', 'Open Comp File',
+                                       'import AdvancedReadNode; AdvancedReadNode.open_comp_file()')
     node.addKnob(open_comp_btn)
     
-    load_lightning_btn = nuke.PyScript_Knob('load_lightning', 'Load Lightning Renders', 'load_lightning_renders()')
+    load_lightning_btn = nuke.PyScript_Knob('load_lightning', 'Load Lightning Renders',
+                                            'import AdvancedReadNode; AdvancedReadNode.load_lightning_renders()')
     node.addKnob(load_lightning_btn)
 
 def create_advanced_read_node():
@@ -1,7 +1,10 @@
-# DynamicShuffleLabeler.py v2.0
+# DynamicShuffleLabeler.py v2.1
 
 import nuke
 import uuid
+import CallbackDispatcher
+import GuardedKnobs
+import BulkRefresh
 
 # User variable for vertical spacing (in pixels)
 VERTICAL_SPACING = 10  # You can adjust this value as needed
@@ -39,48 +42,37 @@ def update_shuffle_node(node):
             in1_value = node['in1'].value().split('.')[-1]  # Get the last part of the in1 value
         
         # Set label and postage stamp based on input
+        # Knobs are only written (and reported) when their value changes
         if in1_value.lower() != 'rgba':
-            node['label'].setValue('[value in1]')
-            node['postage_stamp'].setValue(True)
-            print(f"Updated {node.name()}: Label set to '[value in1]', postage stamp turned on (in1: {in1_value})")
+            label_changed = GuardedKnobs.set_value(node, 'label', '[value in1]')
+            if GuardedKnobs.set_value(node, 'postage_stamp', True) or label_changed:
+                print(f"Updated {node.name()}: Label set to '[value in1]', postage stamp turned on (in1: {in1_value})")
         else:
-            node['label'].setValue('')  # Clear the label if input is 'rgba'
-            node['postage_stamp'].setValue(False)
-            print(f"Updated {node.name()}: Label cleared, postage stamp turned off (in1: rgba)")
+            label_changed = GuardedKnobs.set_value(node, 'label', '')  # Clear the label if input is 'rgba'
+            if GuardedKnobs.set_value(node, 'postage_stamp', False) or label_changed:
+                print(f"Updated {node.name()}: Label cleared, postage stamp turned off (in1: rgba)")
 
-def on_user_create():
+def on_user_create(node):
     """
-    Callback function triggered when a user creates a new node.
+    Callback triggered through CallbackDispatcher when a user creates a Shuffle node.
     """
-    node = nuke.thisNode()
     update_shuffle_node(node)
 
-def on_knob_changed():
+def on_knob_changed(node, knob):
     """
-    Callback function triggered when any knob of a node is changed.
+    Callback triggered through CallbackDispatcher when the 'in1' knob is changed
+    (or without a knob for a new node).
     """
-    node = nuke.thisNode()
-    knob = nuke.thisKnob()
-    
-    # Update if the 'in1' knob is changed or if it's a new node (no knob specified)
-    if knob is None or knob.name() == 'in1':
-        update_shuffle_node(node)
+    update_shuffle_node(node)
 
 def setup_callbacks():
     """
     Set up the necessary callbacks for all existing and future Shuffle and Shuffle2 nodes.
     """
-    # Remove any existing callbacks to prevent duplicates
-    nuke.removeOnUserCreate(on_user_create)
-    nuke.removeKnobChanged(on_knob_changed)
-    
-    # Add callbacks for Shuffle nodes
-    nuke.addOnUserCreate(on_user_create, nodeClass='Shuffle')
-    nuke.addKnobChanged(on_knob_changed, nodeClass='Shuffle')
-    
-    # Add callbacks for Shuffle2 nodes
-    nuke.addOnUserCreate(on_user_create, nodeClass='Shuffle2')
-    nuke.addKnobChanged(on_knob_changed, nodeClass='Shuffle2')
+    # Registering again replaces the previous handlers, so there are no duplicates
+    CallbackDispatcher.register(CallbackDispatcher.ON_USER_CREATE, on_user_create, node_classes=['Shuffle', 'Shuffle2'])
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, on_knob_changed, node_classes=['Shuffle', 'Shuffle2'],
+                                knobs=['in1'], refresh=update_shuffle_node)
 
 def update_existing_shuffle_nodes():
     """
@@ -95,9 +87,10 @@ def initialize_dynamic_shuffle_labeler():
     Initialize the dynamic Shuffle node labeling system.
     """
     setup_callbacks()
-    update_existing_shuffle_nodes()
+    # Existing nodes are refreshed in the shared, time-sliced pass on script load
+    BulkRefresh.register("AdvancedShuffle", update_shuffle_node, node_classes=['Shuffle', 'Shuffle2'])
 
 # Run the initialization process when the script is loaded
 initialize_dynamic_shuffle_labeler()
 
-print(f"Dynamic Shuffle Labeler v2.0 initialized. Vertical spacing set to {VERTICAL_SPACING} pixels.")
+print(f"Dynamic Shuffle Labeler v2.1 initialized. Vertical spacing set to {VERTICAL_SPACING} pixels.")
@@ -1,11 +1,18 @@
-# CryptoMatteTool.py v1.2
+# CryptoMatteTool.py v1.3
 
 import nuke
 import uuid
+import CallbackDispatcher
+import GuardedKnobs
+import BulkRefresh
 
 # User variable for vertical spacing (in pixels)
 VERTICAL_SPACING = 50
 
+CRYPTO_CLASSES = ['Cryptomatte', 'Cryptomatte2']
+# Knobs that should trigger an update
+UPDATE_KNOBS = ['cryptoLayer', 'matteList']
+
 # Unique identifier for nodes created by this script (hidden from user)
 SCRIPT_ID = str(uuid.uuid4())
 
@@ -62,7 +69,7 @@ def update_crypto_node(node):
                 matte_list = matte_list[:max_length] + "..."
             label_parts.append(f"Matte: {matte_list}")
         
-        node['label'].setValue("\n".join(label_parts))
+        GuardedKnobs.set_value(node, 'label', "\n".join(label_parts))
 
         # Check for existing KeepRGBA node created by this script
         our_keep_rgba = find_our_keep_rgba_node(node)
@@ -79,32 +86,19 @@ def update_crypto_node(node):
             except:
                 print(f"Warning: Unable to update position for Remove node after {node.name()}")
 
-def on_user_create():
-    """Callback function triggered when a user creates a new node."""
-    node = nuke.thisNode()
-    if node and node.Class() in ['Cryptomatte', 'Cryptomatte2']:
-        update_crypto_node(node)
+def on_user_create(node):
+    """Callback triggered through CallbackDispatcher when a user creates a Cryptomatte node."""
+    update_crypto_node(node)
 
-def on_knob_changed():
-    """Callback function triggered when any knob of a node is changed."""
-    node = nuke.thisNode()
-    knob = nuke.thisKnob()
-    
-    if node and node.Class() in ['Cryptomatte', 'Cryptomatte2']:
-        # List of knobs that should trigger an update
-        update_knobs = ['cryptoLayer', 'matteList']
-        if knob is None or knob.name() in update_knobs:
-            update_crypto_node(node)
+def on_knob_changed(node, knob):
+    """Callback triggered through CallbackDispatcher when cryptoLayer or matteList is changed."""
+    update_crypto_node(node)
 
 def setup_callbacks():
     """Set up the necessary callbacks for all existing and future Cryptomatte nodes."""
-    nuke.removeOnUserCreate(on_user_create)
-    nuke.removeKnobChanged(on_knob_changed)
-    
-    nuke.addOnUserCreate(on_user_create, nodeClass='Cryptomatte')
-    nuke.addOnUserCreate(on_user_create, nodeClass='Cryptomatte2')
-    nuke.addKnobChanged(on_knob_changed, nodeClass='Cryptomatte')
-    nuke.addKnobChanged(on_knob_changed, nodeClass='Cryptomatte2')
+    CallbackDispatcher.register(CallbackDispatcher.ON_USER_CREATE, on_user_create, node_classes=CRYPTO_CLASSES)
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, on_knob_changed, node_classes=CRYPTO_CLASSES,
+                                knobs=UPDATE_KNOBS, refresh=update_crypto_node)
 
 def update_existing_crypto_nodes():
     """Update all existing Cryptomatte nodes in the script."""
@@ -115,8 +109,8 @@ def update_existing_crypto_nodes():
 def initialize_crypto_matte_tool():
     """Initialize the CryptoMatte Tool system."""
     setup_callbacks()
-    nuke.addOnScriptLoad(update_existing_crypto_nodes)
-    print(f"CryptoMatte Tool v1.2 initialized. Vertical spacing set to {VERTICAL_SPACING} pixels.")
+    BulkRefresh.register("CryptoLabeler", update_crypto_node, node_classes=CRYPTO_CLASSES)
+    print(f"CryptoMatte Tool v1.3 initialized. Vertical spacing set to {VERTICAL_SPACING} pixels.")
 
 # Run the initialization process when the script is loaded
 initialize_crypto_matte_tool()
@@ -1,10 +1,13 @@
-# CryptoMatteFixer.py v2.6
+# CryptoMatteFixer.py v2.7
 #
 # This script fixes issues with Cryptomatte nodes by detecting the correct layer
 # based on the keyer expression and updating the node accordingly.
 
 import nuke
 import re
+import CallbackDispatcher
+import GuardedKnobs
+import BulkRefresh
 
 # User variable to enable/disable the fix
 ENABLE_CRYPTOMATTE_FIX = True
@@ -31,13 +34,12 @@ def update_crypto_node(node):
     current_layer = node['cryptoLayer'].value()
     detected_layer = detect_crypto_layer(node)
     
-    if current_layer != detected_layer:
-        node['cryptoLayer'].setValue(detected_layer)
+    if GuardedKnobs.set_value(node, 'cryptoLayer', detected_layer):
         print(f"Updated {node.name()} from {current_layer} to {detected_layer}")
     
     # Update label
     label = detected_layer.replace('cryptomatte_', '')
-    node['label'].setValue(label)
+    GuardedKnobs.set_value(node, 'label', label)
 
 def process_cryptomattes():
     """Process all Cryptomatte nodes in the script."""
@@ -58,31 +60,21 @@ def process_cryptomattes():
     else:
         print("No Cryptomatte nodes found in the script.")
 
-def on_node_create():
+def on_node_create(node):
     """Callback function for when a Cryptomatte node is created."""
-    node = nuke.thisNode()
-    if node.Class() in ['Cryptomatte', 'Cryptomatte2']:
-        update_crypto_node(node)
+    update_crypto_node(node)
 
-def on_knob_changed():
-    """Callback function for when a knob is changed on a Cryptomatte node."""
-    node = nuke.thisNode()
-    knob = nuke.thisKnob()
-    if node.Class() in ['Cryptomatte', 'Cryptomatte2']:
-        if knob.name() in ['expression', 'cryptoLayer', 'in00', 'cryptoLayerChoice']:
-            update_crypto_node(node)
-
-def on_script_load():
-    """Callback function for when a script is loaded."""
-    process_cryptomattes()
+def on_knob_changed(node, knob):
+    """Callback function for when one of the layer knobs is changed on a Cryptomatte node."""
+    update_crypto_node(node)
 
 def setup_callbacks():
     """Set up the necessary callbacks for Cryptomatte nodes."""
-    nuke.addOnCreate(on_node_create, nodeClass='Cryptomatte')
-    nuke.addOnCreate(on_node_create, nodeClass='Cryptomatte2')
-    nuke.addKnobChanged(on_knob_changed, nodeClass='Cryptomatte')
-    nuke.addKnobChanged(on_knob_changed, nodeClass='Cryptomatte2')
-    nuke.addOnScriptLoad(on_script_load)
+    CallbackDispatcher.register(CallbackDispatcher.ON_CREATE, on_node_create, node_classes=['Cryptomatte', 'Cryptomatte2'])
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, on_knob_changed, node_classes=['Cryptomatte', 'Cryptomatte2'],
+                                knobs=['expression', 'cryptoLayer', 'in00', 'cryptoLayerChoice'], refresh=update_crypto_node)
+    # Existing nodes are fixed in the shared, time-sliced pass on script load
+    BulkRefresh.register("CryptoMatteFixer", update_crypto_node, node_classes=['Cryptomatte', 'Cryptomatte2'])
 
 def run_cryptomatte_fixer():
     """Run the Cryptomatte fixer manually."""
@@ -24,4 +24,5 @@ def delete_all_backdrops():
     print(f"Deleted {num_backdrops} backdrop{'s' if num_backdrops != 1 else ''}.")
 
 # Run the function to delete all backdrops
-delete_all_backdrops()
+if __name__ == "__main__":
+    delete_all_backdrops()
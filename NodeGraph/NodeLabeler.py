@@ -1,11 +1,17 @@
-# AnimatedNodeLabeler.py v2.2.0
+# AnimatedNodeLabeler.py v2.5.2
 #
 # This script modifies the color of animatable Nuke nodes when they have animated values.
 # It adds labels to indicate if a node is animated and shows the mix value when applicable.
 # The color and label functionalities can be toggled independently.
+# Which knobs of a node are animated is cached per node: a knob change only re-checks the
+# changed knob, and all knobs are scanned again only for new or pasted nodes.
+# The default and animated colors are computed once per node class and looked up after that.
 
 import nuke
 import colorsys
+import CallbackDispatcher
+import GuardedKnobs
+import BulkRefresh
 
 # User variables
 ENABLE_DYNAMIC_LABELING = True  # Controls label updates (Animated, Mix)
@@ -16,6 +22,14 @@ VALUE_CHANGE = 1  # Amount to change the value/brightness (-1.0 to 1.0)
 
 # List of node classes to exclude from color modification
 EXCLUDED_NODE_CLASSES = ['BackdropNode', 'StickyNote', 'Dot']
+# Knob changes that cannot change a node's label or color (position and UI events)
+IGNORED_KNOBS = ['xpos', 'ypos', 'selected', 'showPanel', 'hidePanel', 'inputChange']
+
+# Node -> names of its animated knobs. Keyed by the node itself (not its name), so a renamed
+# node keeps its entry and a new node reusing an old name does not inherit it
+_animated_knobs = {}
+# (node class, HUE_CHANGE, SATURATION_CHANGE, VALUE_CHANGE) -> (default color, animated color), or None
+_class_colors = {}
 
 def is_valid_node(node):
     """
@@ -26,6 +40,37 @@ def is_valid_node(node):
     except:
         return False
 
+def get_class_colors(node_class):
+    """
+    Return (default color, animated color) of a node class, or None if the class has no
+    default color. Computed once per class and color settings.
+    """
+    key = (node_class, HUE_CHANGE, SATURATION_CHANGE, VALUE_CHANGE)
+    if key in _class_colors:
+        return _class_colors[key]
+
+    default_color = nuke.defaultNodeColor(node_class)
+    if default_color is None:
+        _class_colors[key] = None
+        return None
+
+    # Extract RGB values
+    r = ((default_color >> 24) & 0xff) / 255.0
+    g = ((default_color >> 16) & 0xff) / 255.0
+    b = ((default_color >> 8) & 0xff) / 255.0
+    
+    # Convert to HSV for color modification
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    h = (h + HUE_CHANGE) % 1.0
+    s = max(0, min(1, s + SATURATION_CHANGE))
+    v = max(0, min(1, v + VALUE_CHANGE))
+    
+    # Convert back to RGB
+    r, g, b = colorsys.hsv_to_rgb(h, s, v)
+    animated_color = int(r * 255) << 24 | int(g * 255) << 16 | int(b * 255) << 8 | 0xff
+    _class_colors[key] = (default_color, animated_color)
+    return _class_colors[key]
+
 def modify_node_color(node, is_animated):
     """
     Modify the color of a given node if it's animated and color changes are enabled.
@@ -41,35 +86,53 @@ def modify_node_color(node, is_animated):
         if current_color != 0:
             return
         
-        # Get the default node color, skip if it's unavailable
-        default_color = nuke.defaultNodeColor(node.Class())
-        if default_color is None:
+        # Look up the default and animated colors of the class, skip if unavailable
+        colors = get_class_colors(node.Class())
+        if colors is None:
             return
+        new_color = colors[1] if is_animated else colors[0]
         
-        if is_animated:
-            # Extract RGB values
-            r = ((default_color >> 24) & 0xff) / 255.0
-            g = ((default_color >> 16) & 0xff) / 255.0
-            b = ((default_color >> 8) & 0xff) / 255.0
-            
-            # Convert to HSV for color modification
-            h, s, v = colorsys.rgb_to_hsv(r, g, b)
-            h = (h + HUE_CHANGE) % 1.0
-            s = max(0, min(1, s + SATURATION_CHANGE))
-            v = max(0, min(1, v + VALUE_CHANGE))
-            
-            # Convert back to RGB and set the new color
-            r, g, b = colorsys.hsv_to_rgb(h, s, v)
-            new_color = int(r * 255) << 24 | int(g * 255) << 16 | int(b * 255) << 8 | 0xff
-        else:
-            new_color = default_color
-        
-        # Apply the new color
-        node['tile_color'].setValue(new_color)
+        # Apply the new color (skipped if it is already set)
+        GuardedKnobs.set_value(node, 'tile_color', new_color)
     except Exception as e:
         print(f"Error modifying color for {node.name()}: {str(e)}")
 
-def update_node_label(node):
+def scan_animated_knobs(node):
+    """
+    Check every knob of the node and cache the names of the animated ones.
+    """
+    animated = set(name for name, knob in node.knobs().items() if knob.isAnimated())
+    _animated_knobs[node] = animated
+    return animated
+
+def is_node_animated(node, knob=None):
+    """
+    Return whether the node has animated knobs. With a changed knob only that knob is
+    checked again; nodes not in the cache yet are scanned once.
+    """
+    animated = _animated_knobs.get(node)
+    if animated is None:
+        animated = scan_animated_knobs(node)
+    elif knob is not None:
+        if knob.isAnimated():
+            animated.add(knob.name())
+        else:
+            animated.discard(knob.name())
+    return bool(animated)
+
+def forget_animated_knobs(node):
+    """
+    Drop any cached state of a new or pasted node.
+    """
+    _animated_knobs.pop(node, None)
+
+def forget_deleted_node(node):
+    """
+    Drop the cached state of a deleted node, so the cache does not keep dead nodes alive.
+    """
+    _animated_knobs.pop(node, None)
+
+def update_node_label(node, is_animated=None):
     """
     Update the label of a single node based on its animation status and mix value.
     """
@@ -77,7 +140,8 @@ def update_node_label(node):
         return False
 
     try:
-        is_animated = any(knob.isAnimated() for knob in node.knobs().values())
+        if is_animated is None:
+            is_animated = is_node_animated(node)
         has_mix = 'mix' in node.knobs()
         
         label_components = []
@@ -97,29 +161,41 @@ def update_node_label(node):
             label_components.append(original_label)
         new_label = '\n'.join(label_components)
         
-        node['label'].setValue(new_label)
+        GuardedKnobs.set_value(node, 'label', new_label)
         
         return is_animated
     except Exception as e:
         print(f"Error updating label for {node.name()}: {str(e)}")
         return False
 
-def on_knob_changed():
+def refresh_node(node, knob=None):
+    """
+    Update the label and/or color of a single node.
+    """
+    is_animated = is_node_animated(node, knob)
+    if ENABLE_DYNAMIC_LABELING:
+        update_node_label(node, is_animated)
+    if ENABLE_COLOR_CHANGES:
+        modify_node_color(node, is_animated)
+
+def rescan_node(node):
+    """
+    Scan all knobs of the node again and update its label and/or color, e.g. after
+    knob changes that were deferred while callbacks were suspended.
+    """
+    scan_animated_knobs(node)
+    refresh_node(node)
+
+def on_knob_changed(node, knob):
     """
-    Callback function triggered when any knob of a node is changed.
+    Callback triggered through CallbackDispatcher when a knob of a node is changed.
     Updates the node's color and/or label based on animation status and enabled functionalities.
     """
     if not (ENABLE_DYNAMIC_LABELING or ENABLE_COLOR_CHANGES):
         return
 
-    node = nuke.thisNode()
-    if not is_valid_node(node):
-        return
-
     try:
-        is_animated = update_node_label(node) if ENABLE_DYNAMIC_LABELING else any(knob.isAnimated() for knob in node.knobs().values())
-        if ENABLE_COLOR_CHANGES:
-            modify_node_color(node, is_animated)
+        refresh_node(node, knob)
     except Exception as e:
         print(f"Error in on_knob_changed for {node.name()}: {str(e)}")
 
@@ -127,8 +203,13 @@ def setup_callback():
     """
     Set up the necessary callback for all existing and future nodes.
     """
-    nuke.removeKnobChanged(on_knob_changed)
-    nuke.addKnobChanged(on_knob_changed, nodeClass='*')
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, on_knob_changed,
+                                exclude_classes=EXCLUDED_NODE_CLASSES, ignore_knobs=IGNORED_KNOBS,
+                                refresh=rescan_node)
+    CallbackDispatcher.register(CallbackDispatcher.ON_CREATE, forget_animated_knobs,
+                                exclude_classes=EXCLUDED_NODE_CLASSES)
+    CallbackDispatcher.register(CallbackDispatcher.ON_DESTROY, forget_deleted_node,
+                                exclude_classes=EXCLUDED_NODE_CLASSES)
 
 def update_all_existing_nodes():
     """
@@ -137,9 +218,7 @@ def update_all_existing_nodes():
     for node in nuke.allNodes():
         if is_valid_node(node):
             try:
-                is_animated = update_node_label(node) if ENABLE_DYNAMIC_LABELING else any(knob.isAnimated() for knob in node.knobs().values())
-                if ENABLE_COLOR_CHANGES:
-                    modify_node_color(node, is_animated)
+                rescan_node(node)
             except Exception as e:
                 print(f"Error updating {node.name()}: {str(e)}")
 
@@ -149,8 +228,10 @@ def initialize_dynamic_labeling_and_coloring():
     """
     if ENABLE_DYNAMIC_LABELING or ENABLE_COLOR_CHANGES:
         setup_callback()
-        update_all_existing_nodes()
+        # Existing nodes are refreshed in the shared, time-sliced pass on script load
+        BulkRefresh.register("NodeLabeler", rescan_node, exclude_classes=EXCLUDED_NODE_CLASSES)
     else:
+        BulkRefresh.unregister("NodeLabeler")
         print("Both dynamic labeling and coloring are disabled.")
 
 def toggle_dynamic_labeling():
@@ -159,8 +240,11 @@ def toggle_dynamic_labeling():
     """
     global ENABLE_DYNAMIC_LABELING
     ENABLE_DYNAMIC_LABELING = not ENABLE_DYNAMIC_LABELING
+    _class_colors.clear()
     print(f"Dynamic labeling {'enabled' if ENABLE_DYNAMIC_LABELING else 'disabled'}.")
     initialize_dynamic_labeling_and_coloring()
+    if ENABLE_DYNAMIC_LABELING or ENABLE_COLOR_CHANGES:
+        BulkRefresh.schedule()  # Existing nodes pick up the new setting
 
 def toggle_color_changes():
     """
@@ -168,8 +252,11 @@ def toggle_color_changes():
     """
     global ENABLE_COLOR_CHANGES
     ENABLE_COLOR_CHANGES = not ENABLE_COLOR_CHANGES
+    _class_colors.clear()
     print(f"Color changes {'enabled' if ENABLE_COLOR_CHANGES else 'disabled'}.")
     initialize_dynamic_labeling_and_coloring()
+    if ENABLE_DYNAMIC_LABELING or ENABLE_COLOR_CHANGES:
+        BulkRefresh.schedule()  # Existing nodes pick up the new setting
 
 # Run the initialization process when the script is loaded
 initialize_dynamic_labeling_and_coloring()
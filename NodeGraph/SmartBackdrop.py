@@ -1,6 +1,7 @@
 import nuke
 import random
 import colorsys
+import SpatialIndex
 
 # User variables
 PADDING = 50  # Padding around nodes
@@ -114,35 +115,25 @@ def create_auto_backdrop():
     return backdrop
 
 def delete_backdrops():
-    """Delete all backdrop nodes that contain the selected nodes"""
+    """Delete the selected backdrop nodes and all backdrop nodes that contain the selected nodes"""
     selected_nodes = nuke.selectedNodes()
     if not selected_nodes:
         return
     
-    # Get all backdrop nodes in the script
-    all_backdrops = [n for n in nuke.allNodes() if n.Class() == "BackdropNode"]
+    # Look up the backdrops around each selected node in a spatial index instead of testing every pair
+    index = SpatialIndex.SpatialIndex()
+    backdrops = []
+    for node in selected_nodes:
+        # backdrops_containing() skips the node itself, so a selected backdrop is added here
+        found = index.backdrops_containing(node)
+        if node.Class() == "BackdropNode":
+            found.append(node)
+        for backdrop in found:
+            if backdrop not in backdrops:
+                backdrops.append(backdrop)
     
-    # For each backdrop, check if it contains any of the selected nodes
-    for backdrop in all_backdrops:
-        bdX = backdrop.xpos()
-        bdY = backdrop.ypos()
-        bdW = backdrop['bdwidth'].value()
-        bdH = backdrop['bdheight'].value()
-        
-        # Check each selected node
-        for node in selected_nodes:
-            nodeX = node.xpos()
-            nodeY = node.ypos()
-            nodeW = node.screenWidth()
-            nodeH = node.screenHeight()
-            
-            # If the node is inside the backdrop bounds
-            if (bdX <= nodeX <= (bdX + bdW) and 
-                bdY <= nodeY <= (bdY + bdH) and 
-                bdX <= (nodeX + nodeW) <= (bdX + bdW) and 
-                bdY <= (nodeY + nodeH) <= (bdY + bdH)):
-                nuke.delete(backdrop)
-                break
+    for backdrop in backdrops:
+        nuke.delete(backdrop)
 
 # Add the Auto Backdrop commands to Nuke's menu
 menu = nuke.menu('Nuke')
@@ -1,4 +1,4 @@
-# Nuke Advanced Grab Tool v3.8
+# Nuke Advanced Grab Tool v4.6
 #
 # This script implements an advanced grab tool to mimic Nuke's native node movement behavior.
 #
@@ -6,16 +6,32 @@
 # - Standard Grab (E): Moves only selected nodes.
 # - Input Tree Grab (Cmd+Option+E): Moves the selected node and all its upstream nodes.
 # - Full Tree Grab (Cmd+E): Moves the entire connected node tree (upstream and downstream).
+# - Backdrop Grab (Option+E): Moves the selected backdrops with everything inside them,
+#   nested backdrops included. A selected node that is not a backdrop grabs the innermost
+#   backdrop around it. Contents are looked up in a SpatialIndex built once per grab.
 # - Exit grab mode by pressing 'E' again
 # - Option to keep nodes selected after exiting grab mode
 # - Proper handling of zoom levels for consistent movement speed
 # - Middle mouse button or Alt + Left click freezes movement without changing position on release
+# - Mouse movement is accumulated and applied at most once per display frame, so large
+#   tree grabs stay responsive; the zoom level is read once per grab
+# - Proxy drag: grabs of more than PROXY_DRAG_THRESHOLD nodes only drag a small set of
+#   representative nodes (the selection, the outermost nodes and an even sample); every
+#   node is written in one batch on confirm, and cancel only has to restore the proxies
+# - Tree grabs read each node's connections at most once per grab (DagSnapshot) and collect
+#   trees iteratively, so deep comps cannot hit the recursion limit; input tree grabs only
+#   read the selection's inputs, full tree grabs read every node once, hidden inputs included
+# - The toolkit's knobChanged callbacks (labels, colours, Cryptomatte, Shuffle) are
+#   suspended while grabbing, so moving nodes does not wake them for every xpos/ypos change
+# - Undo is not recorded while dragging; confirming records one position change per node,
+#   so a single Ctrl+Z restores the grab however long the drag was
 #
 # Usage:
 # 1. Select a node or nodes in Nuke
 # 2. Press 'E' to move only the selected node(s)
 # 3. Press 'Cmd+Option+E' to move the selected node and all its inputs
 # 4. Press 'Cmd+E' to move the entire connected node tree
+#    or 'Option+E' to move the selected backdrop(s) and their contents
 # 5. Move the mouse to reposition the nodes
 # 6. Hold middle mouse button or Alt + Left click to freeze movement
 # 7. Left-click, press 'Enter', or press 'E' again to confirm the new position
@@ -23,10 +39,97 @@
 # 9. Press 'Z' to lock movement to X-axis, 'Y' to lock movement to Y-axis
 
 import nuke
+from collections import deque
+import CallbackSuspension
+import SpatialIndex
 from PySide2 import QtCore, QtGui, QtWidgets
 
 # User variable to control whether nodes remain selected after grab mode
 KEEP_NODES_SELECTED = True
+# Milliseconds between node position updates while dragging (16 = ~60 updates per second)
+MOVE_INTERVAL_MS = 16
+# Grabs affecting more nodes than this drag representative proxy nodes instead of every node
+PROXY_DRAG_THRESHOLD = 300
+# Maximum number of nodes dragged in proxy mode
+PROXY_NODE_COUNT = 24
+
+class DagSnapshot(object):
+    """Connections of the DAG's nodes, each node read at most once per grab.
+
+    Nodes are read lazily as a walk reaches them, so an input tree grab only touches the
+    selection and its inputs. connected() needs every node and reads them all in one pass
+    over allNodes(). With hidden_inputs, connections Nuke does not draw (e.g. a ScanlineRender's
+    hidden inputs) count too, like dependencies(nuke.INPUTS | nuke.HIDDEN_INPUTS).
+    """
+
+    def __init__(self, hidden_inputs=False):
+        self.hidden_inputs = hidden_inputs
+        self.inputs = {}
+        self._complete = False
+        self._parents = None
+        self._members = None
+
+    def inputs_of(self, node):
+        inputs = self.inputs.get(node)
+        if inputs is None:
+            # Also used for nodes outside the current group, e.g. inputs coming from another group
+            if self.hidden_inputs:
+                inputs = self.inputs[node] = node.dependencies(nuke.INPUTS | nuke.HIDDEN_INPUTS)
+            else:
+                inputs = self.inputs[node] = [n for n in (node.input(i) for i in range(node.inputs())) if n is not None]
+        return inputs
+
+    def read_all(self):
+        if not self._complete:
+            for node in nuke.allNodes():
+                self.inputs_of(node)
+            self._complete = True
+
+    def upstream(self, start_nodes):
+        """Return start_nodes and everything feeding them, with one breadth-first search shared by all starts."""
+        visited = set()
+        queue = deque(start_nodes)
+        while queue:
+            node = queue.popleft()
+            if node in visited:
+                continue
+            visited.add(node)
+            queue.extend(n for n in self.inputs_of(node) if n not in visited)
+        return visited
+
+    def connected(self, start_nodes):
+        """Return every node connected to start_nodes upstream or downstream (their whole trees)."""
+        if self._members is None:
+            self.read_all()
+            self._build_components()
+        connected = set(start_nodes)
+        for root in set(self._find(node) for node in start_nodes if node in self._parents):
+            connected.update(self._members[root])
+        return connected
+
+    def _find(self, node):
+        parents = self._parents
+        # Nuke returns a new wrapper object per call, so nodes are compared with == rather than 'is'
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]  # Path halving
+            node = parents[node]
+        return node
+
+    def _build_components(self):
+        """Union-find over all connections; every selected node in the same tree then shares one result.
+
+        Each connection is joined both ways, so outputs are found without calling dependent().
+        """
+        self._parents = {node: node for node in self.inputs}
+        for node, inputs in list(self.inputs.items()):
+            for input_node in inputs:
+                self._parents.setdefault(input_node, input_node)
+                root, input_root = self._find(node), self._find(input_node)
+                if root != input_root:
+                    self._parents[input_root] = root
+        self._members = {}
+        for node in self._parents:
+            self._members.setdefault(self._find(node), []).append(node)
 
 class AdvancedGrabTool(QtCore.QObject):
     def __init__(self):
@@ -37,7 +140,11 @@ class AdvancedGrabTool(QtCore.QObject):
         self.selected_nodes = []
         self.affected_nodes = set()
         self.original_positions = {}
-        self.current_positions = {}
+        self.moving_nodes = set()
+        self.proxy_drag = False
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.undo_disabled = False
         self.original_cursor = None
         self.locked = False
         self.lock_x = False
@@ -45,34 +152,35 @@ class AdvancedGrabTool(QtCore.QObject):
         self.grab_mode = "standard"
         self.freeze_movement = False
         self.alt_pressed = False
+        self.zoom = 1.0
+        self.pending_pos = None
+        self.hand_closed = False
+        self.move_timer = QtCore.QTimer(self)
+        self.move_timer.setSingleShot(True)
+        self.move_timer.setInterval(MOVE_INTERVAL_MS)
+        self.move_timer.timeout.connect(self.flush_movement)
 
-    def get_input_tree(self, node, upstream=None):
-        if upstream is None:
-            upstream = set()
-        if node not in upstream:
-            upstream.add(node)
-            for i in range(node.inputs()):
-                input_node = node.input(i)
-                if input_node:
-                    self.get_input_tree(input_node, upstream)
-        return upstream
-
-    def get_connected_nodes(self, start_node):
-        connected = set()
-        to_process = [start_node]
-        
-        while to_process:
-            node = to_process.pop(0)
-            if node not in connected:
-                connected.add(node)
-                
-                inputs = node.dependencies(nuke.INPUTS | nuke.HIDDEN_INPUTS)
-                to_process.extend([n for n in inputs if n not in connected])
-                
-                outputs = node.dependent(nuke.INPUTS | nuke.HIDDEN_INPUTS)
-                to_process.extend([n for n in outputs if n not in connected])
-        
-        return connected
+    def get_input_tree(self, node, snapshot=None):
+        return (snapshot or DagSnapshot()).upstream([node])
+
+    def get_connected_nodes(self, start_node, snapshot=None):
+        return (snapshot or DagSnapshot(hidden_inputs=True)).connected([start_node])
+
+    def get_backdrop_contents(self, nodes, index=None):
+        """Return the backdrops of nodes (a non-backdrop node gives its innermost backdrop) and everything inside them."""
+        index = index or SpatialIndex.SpatialIndex()
+        affected = set()
+        for node in nodes:
+            if node.Class() != 'BackdropNode':
+                backdrops = index.backdrops_containing(node)
+                if not backdrops:
+                    affected.add(node)
+                    continue
+                node = backdrops[-1]
+            affected.add(node)
+            # Nested backdrops and their contents lie inside the outer rectangle, so one query covers them
+            affected.update(index.contents(node))
+        return affected
 
     def activate_grab(self, mode="standard"):
         if self.locked:
@@ -87,21 +195,26 @@ class AdvancedGrabTool(QtCore.QObject):
         self.grab_mode = mode
 
         if self.grab_mode == "input_tree":
-            self.affected_nodes = set()
-            for node in self.selected_nodes:
-                self.affected_nodes.update(self.get_input_tree(node))
+            self.affected_nodes = DagSnapshot().upstream(self.selected_nodes)
         elif self.grab_mode == "full_tree":
-            self.affected_nodes = set()
-            for node in self.selected_nodes:
-                self.affected_nodes.update(self.get_connected_nodes(node))
+            self.affected_nodes = DagSnapshot(hidden_inputs=True).connected(self.selected_nodes)
+        elif self.grab_mode == "backdrop":
+            self.affected_nodes = self.get_backdrop_contents(self.selected_nodes)
         else:  # standard mode
             self.affected_nodes = set(self.selected_nodes)
 
         self.original_positions = {node: (node.xpos(), node.ypos()) for node in self.affected_nodes}
-        self.current_positions = self.original_positions.copy()
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.proxy_drag = len(self.affected_nodes) > PROXY_DRAG_THRESHOLD
+        self.moving_nodes = self.pick_proxy_nodes() if self.proxy_drag else self.affected_nodes
 
         self.start_pos = QtGui.QCursor.pos()
         self.last_pos = self.start_pos
+        self.pending_pos = None
+        self.hand_closed = False
+        # The DAG cannot be zoomed while the grab holds the mouse, so read the zoom once
+        self.zoom = nuke.zoom() or 1.0
         
         app = QtWidgets.QApplication.instance()
         self.original_cursor = app.overrideCursor()
@@ -109,9 +222,14 @@ class AdvancedGrabTool(QtCore.QObject):
         
         app.installEventFilter(self)
 
-        nuke.Undo().begin("Grab Tool")
+        # The drag is not recorded; apply_grab records the whole move as one undo step
+        nuke.Undo().disable()
+        self.undo_disabled = True
+        CallbackSuspension.suspend()
 
     def deactivate_grab(self):
+        self.move_timer.stop()
+        self.pending_pos = None
         self.grab_active = False
         self.locked = False
         self.lock_x = False
@@ -121,44 +239,102 @@ class AdvancedGrabTool(QtCore.QObject):
         self.last_pos = None
         self.alt_pressed = False
         
-        app = QtWidgets.QApplication.instance()
-        while app.overrideCursor() is not None:
-            app.restoreOverrideCursor()
+        # Undo and the toolkit's callbacks are global: they are restored however the grab ends
+        try:
+            app = QtWidgets.QApplication.instance()
+            while app.overrideCursor() is not None:
+                app.restoreOverrideCursor()
 
-        if self.original_cursor:
-            app.setOverrideCursor(self.original_cursor)
-        
-        QtWidgets.QApplication.instance().removeEventFilter(self)
+            if self.original_cursor:
+                app.setOverrideCursor(self.original_cursor)
+            
+            QtWidgets.QApplication.instance().removeEventFilter(self)
 
-        if not KEEP_NODES_SELECTED:
-            for node in self.affected_nodes:
-                node.setSelected(False)
-        
-        self.affected_nodes.clear()
+            if not KEEP_NODES_SELECTED:
+                for node in self.affected_nodes:
+                    node.setSelected(False)
+        finally:
+            self.affected_nodes = set()
+            self.moving_nodes = set()
+            self.proxy_drag = False
 
-        nuke.Undo().end()
+            CallbackSuspension.resume()
+            self.enable_undo()
 
     def apply_grab(self):
-        for node, (x, y) in self.current_positions.items():
-            node.setXYpos(int(x), int(y))
-        self.deactivate_grab()
+        try:
+            self.flush_movement()
+            if self.grab_active and (int(self.offset_x) or int(self.offset_y)):
+                # Put the dragged nodes back unrecorded, then record every node's move in one undo group
+                for node in self.moving_nodes:
+                    x, y = self.original_positions[node]
+                    node.setXYpos(x, y)
+                self.enable_undo()
+                undo = nuke.Undo()
+                undo.begin("Grab Tool")
+                try:
+                    for node in self.affected_nodes:
+                        x, y = self.grabbed_position(node)
+                        node.setXYpos(x, y)
+                finally:
+                    undo.end()
+        finally:
+            if self.grab_active:
+                self.deactivate_grab()
+
+    def enable_undo(self):
+        if self.undo_disabled:
+            self.undo_disabled = False
+            nuke.Undo().enable()
 
     def cancel_grab(self):
-        for node, (x, y) in self.original_positions.items():
-            node.setXYpos(x, y)
-        self.deactivate_grab()
+        self.move_timer.stop()
+        self.pending_pos = None
+        try:
+            # Only the dragged nodes were moved
+            for node in self.moving_nodes:
+                x, y = self.original_positions[node]
+                node.setXYpos(x, y)
+        finally:
+            self.deactivate_grab()
+
+    def pick_proxy_nodes(self):
+        """Pick the nodes dragged in place of a large grab: the selection, the outermost nodes and an even sample."""
+        positions = self.original_positions
+        nodes = sorted(self.affected_nodes, key=lambda node: positions[node])
+        # Backdrops outline what is being moved, so the largest ones are dragged with the selection
+        backdrops = sorted((node for node in nodes if node.Class() == 'BackdropNode'),
+                           key=lambda node: -node['bdwidth'].value() * node['bdheight'].value())
+        proxies = set(([node for node in self.selected_nodes if node in positions] + backdrops)[:PROXY_NODE_COUNT // 2])
+        proxies.update([
+            nodes[0], nodes[-1],
+            min(nodes, key=lambda node: positions[node][1]),
+            max(nodes, key=lambda node: positions[node][1]),
+        ])
+        remaining = PROXY_NODE_COUNT - len(proxies)
+        if remaining > 0:
+            step = max(1, len(nodes) // remaining)
+            proxies.update(nodes[step // 2::step][:remaining])
+        return proxies
+
+    def grabbed_position(self, node):
+        x, y = self.original_positions[node]
+        return int(x) + int(self.offset_x), int(y) + int(self.offset_y)
 
     def eventFilter(self, obj, event):
         if self.grab_active:
             if event.type() == QtCore.QEvent.MouseMove:
-                app = QtWidgets.QApplication.instance()
-                app.changeOverrideCursor(QtGui.QCursor(QtCore.Qt.ClosedHandCursor))
+                if not self.hand_closed:
+                    QtWidgets.QApplication.instance().changeOverrideCursor(QtGui.QCursor(QtCore.Qt.ClosedHandCursor))
+                    self.hand_closed = True
                 if not self.freeze_movement:
-                    self.update_positions(event.globalPos())
+                    self.queue_movement(event.globalPos())
             elif event.type() == QtCore.QEvent.MouseButtonPress:
                 if event.button() == QtCore.Qt.MiddleButton:
+                    self.flush_movement()
                     self.freeze_movement = True
                 elif event.button() == QtCore.Qt.LeftButton and self.alt_pressed:
+                    self.flush_movement()
                     self.freeze_movement = True
             elif event.type() == QtCore.QEvent.MouseButtonRelease:
                 if event.button() == QtCore.Qt.LeftButton and not self.alt_pressed:
@@ -170,10 +346,12 @@ class AdvancedGrabTool(QtCore.QObject):
                 if event.key() == QtCore.Qt.Key_Alt:
                     self.alt_pressed = True
                 elif event.key() == QtCore.Qt.Key_Z:
+                    self.flush_movement()
                     self.lock_x = True
                     self.lock_y = False
                     return True
                 elif event.key() == QtCore.Qt.Key_Y:
+                    self.flush_movement()
                     self.lock_y = True
                     self.lock_x = False
                     return True
@@ -194,34 +372,47 @@ class AdvancedGrabTool(QtCore.QObject):
                         self.last_pos = QtGui.QCursor.pos()
         return False
 
+    def queue_movement(self, current_pos):
+        """Remember the newest cursor position; the nodes follow it on the next frame tick."""
+        self.pending_pos = current_pos
+        if not self.move_timer.isActive():
+            self.move_timer.start()
+
+    def flush_movement(self):
+        """Apply the cursor movement accumulated since the last frame tick."""
+        self.move_timer.stop()
+        if self.pending_pos is not None and self.grab_active:
+            current_pos, self.pending_pos = self.pending_pos, None
+            try:
+                self.update_positions(current_pos)
+            except Exception as e:
+                # E.g. a node deleted mid-drag; ending the grab restores undo and the callbacks
+                print(f"Grab cancelled: {str(e)}")
+                self.cancel_grab()
+
     def update_positions(self, current_pos):
         if self.last_pos is None:
             self.last_pos = self.start_pos
 
         offset = current_pos - self.last_pos
+        self.last_pos = current_pos
         
-        # Get the current zoom level
-        zoom = nuke.zoom()
+        # Apply zoom-adjusted scaling, honouring the axis locks
+        offset_x = 0.0 if self.lock_y else offset.x() / self.zoom
+        offset_y = 0.0 if self.lock_x else offset.y() / self.zoom
+        if not offset_x and not offset_y:
+            return
         
-        # Apply zoom-adjusted scaling
-        scaled_offset = QtCore.QPointF(offset.x() / zoom, offset.y() / zoom)
+        previous_x, previous_y = int(self.offset_x), int(self.offset_y)
+        self.offset_x += offset_x
+        self.offset_y += offset_y
+        # Sub-pixel moves (zoomed in) do not change the nodes' integer positions
+        if int(self.offset_x) == previous_x and int(self.offset_y) == previous_y:
+            return
         
-        for node in self.affected_nodes:
-            current_x, current_y = self.current_positions[node]
-            if self.lock_x:
-                new_x = current_x + scaled_offset.x()
-                new_y = current_y
-            elif self.lock_y:
-                new_x = current_x
-                new_y = current_y + scaled_offset.y()
-            else:
-                new_x = current_x + scaled_offset.x()
-                new_y = current_y + scaled_offset.y()
-            
-            self.current_positions[node] = (new_x, new_y)
-            node.setXYpos(int(new_x), int(new_y))
-
-        self.last_pos = current_pos
+        for node in self.moving_nodes:
+            x, y = self.grabbed_position(node)
+            node.setXYpos(x, y)
 
 grab_tool = AdvancedGrabTool()
 
@@ -237,7 +428,11 @@ def grab_input_tree():
 def grab_full_tree():
     grab_tool.activate_grab(mode="full_tree")
 
+def grab_backdrop():
+    grab_tool.activate_grab(mode="backdrop")
+
 # Add the Grab tool commands to Nuke's menu
 nuke.menu('Nuke').addCommand('Edit/Grab Tool', grab_standard, 'e')
 nuke.menu('Nuke').addCommand('Edit/Grab Input Tree', grab_input_tree, 'ctrl+e')
 nuke.menu('Nuke').addCommand('Edit/Grab Full Tree', grab_full_tree, 'alt+ctrl+e')
+nuke.menu('Nuke').addCommand('Edit/Grab Backdrop', grab_backdrop, 'alt+e')
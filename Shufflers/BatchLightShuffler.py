@@ -111,4 +111,5 @@ def batch_split_light_channels():
     nuke.message(f"Processed {len(selected_nodes)} node(s).")
 
 # Run the batch operation
-batch_split_light_channels()
+if __name__ == "__main__":
+    batch_split_light_channels()
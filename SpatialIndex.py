@@ -0,0 +1,110 @@
+# SpatialIndex.py v1.0
+#
+# Grid-hash index of node and backdrop rectangles in the DAG, built in one pass.
+# Every rectangle is registered in the CELL_SIZE x CELL_SIZE grid cells it overlaps, so
+# "which backdrops contain this node" and "what is inside this backdrop" only look at the
+# items in the few cells involved instead of testing every node against every backdrop.
+#
+# Usage:
+#   index = SpatialIndex.SpatialIndex()                # all nodes of the current DAG
+#   index.backdrops_containing(node)                   # backdrops around node
+#   index.contents(backdrop)                           # nodes and nested backdrops inside
+#
+# The index is a snapshot: build a new one after nodes are moved or resized.
+
+import nuke
+
+# User variables
+CELL_SIZE = 512  # Grid cell size in DAG units; a few nodes wide works well for typical comps
+
+class SpatialIndex(object):
+    def __init__(self, nodes=None, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.rects = {}  # node -> (left, top, right, bottom)
+        self.backdrops = []
+        self._cells = {}  # (column, row) -> [node, ...] for every node and backdrop
+        self._backdrop_cells = {}  # (column, row) -> [backdrop, ...]
+        for node in nuke.allNodes() if nodes is None else nodes:
+            self.add(node)
+
+    def add(self, node):
+        if node.Class() == 'BackdropNode':
+            left, top = node.xpos(), node.ypos()
+            rect = (left, top, left + node['bdwidth'].value(), top + node['bdheight'].value())
+            self.backdrops.append(node)
+            for cell in self._cells_of(rect):
+                self._backdrop_cells.setdefault(cell, []).append(node)
+        else:
+            left, top = node.xpos(), node.ypos()
+            rect = (left, top, left + node.screenWidth(), top + node.screenHeight())
+        self.rects[node] = rect
+        for cell in self._cells_of(rect):
+            self._cells.setdefault(cell, []).append(node)
+
+    def _cells_of(self, rect):
+        size = self.cell_size
+        left, top, right, bottom = rect
+        return [(column, row)
+                for column in range(int(left // size), int(right // size) + 1)
+                for row in range(int(top // size), int(bottom // size) + 1)]
+
+    def rect(self, node):
+        """Return the (left, top, right, bottom) rectangle of an indexed node."""
+        return self.rects[node]
+
+    def backdrops_containing(self, node, fully=True):
+        """Return the backdrops around node, outermost first.
+
+        fully requires the whole node rectangle inside the backdrop (as Nuke does when moving
+        a backdrop); otherwise only its top-left corner has to be inside.
+        """
+        left, top, right, bottom = self.rects[node] if node in self.rects else _node_rect(node)
+        size = self.cell_size
+        found = []
+        for backdrop in self._backdrop_cells.get((int(left // size), int(top // size)), []):
+            if backdrop == node:
+                continue
+            bd_left, bd_top, bd_right, bd_bottom = self.rects[backdrop]
+            if bd_left <= left <= bd_right and bd_top <= top <= bd_bottom:
+                if not fully or (right <= bd_right and bottom <= bd_bottom):
+                    found.append(backdrop)
+        found.sort(key=lambda backdrop: -_area(self.rects[backdrop]))
+        return found
+
+    def contents(self, backdrop, fully=True):
+        """Return the nodes and nested backdrops inside backdrop (not backdrop itself)."""
+        bd_left, bd_top, bd_right, bd_bottom = self.rects[backdrop]
+        inside = []
+        seen = set([backdrop])
+        for cell in self._cells_of(self.rects[backdrop]):
+            for node in self._cells.get(cell, []):
+                if node in seen:
+                    continue
+                seen.add(node)
+                left, top, right, bottom = self.rects[node]
+                if bd_left <= left <= bd_right and bd_top <= top <= bd_bottom:
+                    if not fully or (right <= bd_right and bottom <= bd_bottom):
+                        inside.append(node)
+        return inside
+
+    def query(self, rect):
+        """Return every indexed node whose rectangle overlaps rect (left, top, right, bottom)."""
+        left, top, right, bottom = rect
+        found = []
+        seen = set()
+        for cell in self._cells_of(rect):
+            for node in self._cells.get(cell, []):
+                if node in seen:
+                    continue
+                seen.add(node)
+                node_left, node_top, node_right, node_bottom = self.rects[node]
+                if node_left <= right and left <= node_right and node_top <= bottom and top <= node_bottom:
+                    found.append(node)
+        return found
+
+def _node_rect(node):
+    left, top = node.xpos(), node.ypos()
+    return left, top, left + node.screenWidth(), top + node.screenHeight()
+
+def _area(rect):
+    return (rect[2] - rect[0]) * (rect[3] - rect[1])
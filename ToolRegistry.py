@@ -0,0 +1,67 @@
+# ToolRegistry.py v1.0
+#
+# Lazy loading of the toolkit for menu.py. Menu commands are registered as small stubs
+# that import the tool's module the first time the command is used, so Nuke startup only
+# pays for building the menus. Tools that must be active in every script (the knobChanged
+# and onCreate callbacks) are imported at startup with load_at_startup().
+#
+# Import times are recorded; menu.py prints the startup cost, and the first use of each
+# tool prints how long its import took.
+#
+# Usage (menu.py):
+#   ToolRegistry.add_command('Custom/Loaders/Sequence Loader', 'SequenceLoader',
+#                            'load_sequence_and_create_contact_sheet')
+#   ToolRegistry.load_at_startup('NodeLabeler')
+#   print(ToolRegistry.startup_report())
+
+import functools
+import importlib
+import sys
+import time
+import nuke
+
+# User variables
+REPORT_IMPORT_TIMES = True  # Print startup and first-use import times in the Script Editor
+
+import_times = {}  # module name -> seconds spent importing it
+_menu_seconds = 0.0
+_commands = 0
+
+def load(module_name):
+    """Import module_name once and record how long the import took."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_times[module_name] = time.perf_counter() - start
+    return module
+
+def run(module_name, function_name):
+    """Menu stub: import the tool on first use and call its entry function."""
+    first_use = module_name not in sys.modules
+    function = getattr(load(module_name), function_name)
+    if first_use and REPORT_IMPORT_TIMES:
+        print(f"Loaded {module_name} in {import_times[module_name] * 1000:.1f} ms")
+    return function()
+
+def add_command(path, module_name, function_name, shortcut='', icon='', menu='Nuke', **kwargs):
+    """Add a menu command that imports module_name only when the command is first used."""
+    global _menu_seconds, _commands
+    start = time.perf_counter()
+    nuke.menu(menu).addCommand(path, functools.partial(run, module_name, function_name), shortcut, icon=icon, **kwargs)
+    _menu_seconds += time.perf_counter() - start
+    _commands += 1
+
+def load_at_startup(module_name):
+    """Import a tool that has to be active from startup; a failing tool does not stop the others."""
+    try:
+        load(module_name)
+    except Exception as e:
+        print(f"Could not load {module_name}: {str(e)}")
+
+def startup_report():
+    imports = sorted(import_times.items(), key=lambda item: -item[1])
+    total = _menu_seconds + sum(seconds for _, seconds in imports)
+    parts = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in imports)
+    return (f"Toolkit startup: {total * 1000:.1f} ms ({_commands} menu commands {_menu_seconds * 1000:.1f} ms"
+            + (f"; imports: {parts})" if parts else ")"))
@@ -1,5 +1,5 @@
 """
-ZDefocus Controller Script for Nuke - v16
+ZDefocus Controller Script for Nuke - v17
 
 This script creates or updates a centralized controller for all PxF_ZDefocusHERO nodes in a Nuke script.
 It initializes the controller with camera values (except for focal plane) and sets all ZDefocus nodes to match the template.
@@ -22,17 +22,15 @@ def get_camera_values():
         }
     return {'focalLength': 32, 'fstop': 5.6}  # Default values
 
+def reset_controller_values():
+    controller = nuke.toNode('PxF_ZDefocusHERO_Controller')
+    camera_values = get_camera_values()
+    if controller:
+        for knob, value in camera_values.items():
+            if knob in controller.knobs():
+                controller[knob].setValue(value)
+
 def create_zdefocus_controller():
-    global reset_controller_values  # Make this function globally accessible
-    
-    def reset_controller_values():
-        controller = nuke.toNode('PxF_ZDefocusHERO_Controller')
-        camera_values = get_camera_values()
-        if controller:
-            for knob, value in camera_values.items():
-                if knob in controller.knobs():
-                    controller[knob].setValue(value)
-    
     existing_controller = nuke.toNode('PxF_ZDefocusHERO_Controller')
     if existing_controller:
         nuke.delete(existing_controller)
@@ -66,7 +64,8 @@ def create_zdefocus_controller():
         elif knob_name == 'FocalPlane':
             knob.setValue(100)  # Default value for FocalPlane
 
-    controller.addKnob(nuke.PyScript_Knob('reset', 'Reset to Camera Values', 'reset_controller_values()'))
+    controller.addKnob(nuke.PyScript_Knob('reset', 'Reset to Camera Values',
+                                         'import ZdefocusController; ZdefocusController.reset_controller_values()'))
     
     controller['knobChanged'].setValue("""
 n = nuke.thisNode()
@@ -0,0 +1,14 @@
+# init.py
+#
+# Adds the tool folders to Nuke's plugin path so the scripts can import the shared
+# modules that live next to them (e.g. Loaders/RenderIndex.py), and so menu.py can
+# import every tool by module name when its command is first used.
+
+import nuke
+
+nuke.pluginAddPath('./Loaders')
+nuke.pluginAddPath('./Loaders/NewShot')
+nuke.pluginAddPath('./NodeGraph')
+nuke.pluginAddPath('./Shufflers')
+nuke.pluginAddPath('./CopyCat')
+nuke.pluginAddPath('./Else')
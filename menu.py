@@ -0,0 +1,61 @@
+# menu.py
+#
+# Registers the toolkit's menu commands. Commands are lazy stubs (see ToolRegistry.py):
+# a tool is imported the first time its command is used. Only the callback tools, which
+# have to be active in every script, are imported at startup.
+
+import ToolRegistry
+import CallbackProfiler
+import BulkRefresh
+
+if CallbackProfiler.ENABLE_PROFILING:
+    CallbackProfiler.start()
+
+# Callback tools (labels, colors, Cryptomatte, Shuffle, Inference, Read)
+for module_name in ['NodeLabeler', 'CryptoLabeler', 'AdvancedShuffle', 'CryptoMatteFixer',
+                    'InferenceNodeCallback', 'AdvancedReadNode']:
+    ToolRegistry.load_at_startup(module_name)
+# One refresh pass for all of them over the nodes already in the script (later scripts get theirs on load)
+BulkRefresh.schedule()
+
+# Node graph
+ToolRegistry.add_command('Edit/Grab Tool', 'NukeGrabTool', 'grab_standard', 'e')
+ToolRegistry.add_command('Edit/Grab Input Tree', 'NukeGrabTool', 'grab_input_tree', 'ctrl+e')
+ToolRegistry.add_command('Edit/Grab Full Tree', 'NukeGrabTool', 'grab_full_tree', 'alt+ctrl+e')
+ToolRegistry.add_command('Edit/Grab Backdrop', 'NukeGrabTool', 'grab_backdrop', 'alt+e')
+ToolRegistry.add_command('Edit/Auto Backdrop', 'SmartBackdrop', 'create_auto_backdrop', 'shift+b')
+ToolRegistry.add_command('Edit/Delete Backdrops', 'SmartBackdrop', 'delete_backdrops', 'ctrl+shift+b')
+ToolRegistry.add_command('Edit/Delete All Backdrops', 'DeleteAllBackdrops', 'delete_all_backdrops')
+ToolRegistry.add_command('Custom/MergeColorNodes', 'MergeCC', 'run_merge_color_nodes', 'Ctrl+Alt+R',
+                         icon='ColorMath.png', menu='Nodes')
+
+# Loaders
+ToolRegistry.add_command('Custom/Loaders/Sequence Loader', 'SequenceLoader', 'load_sequence_and_create_contact_sheet')
+ToolRegistry.add_command('Custom/Loaders/Appender Loader', 'AppenderLoader', 'load_sequence_and_create_append_clip')
+ToolRegistry.add_command('Custom/Loaders/Color Script Creator', 'ColorScriptCreator', 'load_all_sequences_and_create_color_script')
+ToolRegistry.add_command('Custom/Loaders/Camera Loader', 'CameraLoader', 'run_script')
+ToolRegistry.add_command('Custom/Loaders/Load Lighting Render', 'LoadLightningRender', 'find_latest_renders')
+ToolRegistry.add_command('Custom/Loaders/Load Lighting Render From Render', 'LoadLightningRenderFromRender',
+                         'find_latest_renders_and_setup_crypto')
+ToolRegistry.add_command('Custom/Loaders/New Comp Shot', 'NewCompShot', 'create_new_comp_shot')
+ToolRegistry.add_command('Custom/Loaders/New Denoise Comp', 'NewDenoiseComp', 'main')
+ToolRegistry.add_command('Custom/Open Comp from Read Node', 'OpenCompFromRender', 'open_comp_file')
+
+# Shufflers
+ToolRegistry.add_command('Custom/Shufflers/Batch Light Shuffler', 'BatchLightShuffler', 'batch_split_light_channels')
+ToolRegistry.add_command('Custom/Shufflers/Batch Light Shuffler Horizontal', 'BatchLightShufflerHorizontal',
+                         'batch_split_light_channels')
+ToolRegistry.add_command('Custom/Shufflers/Mask Checker Premult', 'MaskCheckerPremult',
+                         'mask_channel_splitter_with_individual_premults_and_hero_dot')
+
+# Miscellaneous
+ToolRegistry.add_command('Custom/Fix Cryptomatte Nodes', 'CryptoMatteFixer', 'run_cryptomatte_fixer')
+ToolRegistry.add_command('Custom/ZDefocus Controller', 'ZdefocusController', 'create_zdefocus_controller')
+ToolRegistry.add_command('Custom/ZDefocus Checker', 'zdefocuschecker', 'find_wrong_zdefocus_nodes')
+ToolRegistry.add_command('Custom/CopyCat/FrameHold Splitter', 'FrameHoldSplitter', 'main')
+ToolRegistry.add_command('Custom/Callback Profiler/Start', 'CallbackProfiler', 'start')
+ToolRegistry.add_command('Custom/Callback Profiler/Print Report', 'CallbackProfiler', 'print_report')
+ToolRegistry.add_command('Custom/Callback Profiler/Stop', 'CallbackProfiler', 'stop')
+
+if ToolRegistry.REPORT_IMPORT_TIMES:
+    print(ToolRegistry.startup_report())
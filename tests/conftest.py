@@ -0,0 +1,21 @@
+# Tests run outside Nuke against the FakeNuke stand-in from Benchmarks/, which is
+# installed as the nuke module before any tool is imported.
+
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("", "Benchmarks", "NodeGraph", "CopyCat", "Loaders", "Loaders/NewShot", "Shufflers", "Else"):
+    sys.path.insert(0, os.path.join(REPO_DIR, folder))
+
+import FakeNuke
+FakeNuke.install()
+
+@pytest.fixture
+def nuke():
+    """The FakeNuke module with an empty script."""
+    FakeNuke.reset()
+    yield FakeNuke
+    FakeNuke.reset()
@@ -0,0 +1,16 @@
+import os
+
+import AdvancedReadNode
+
+from conftest import REPO_DIR
+
+def test_load_lightning_renders_button_runs_the_loader(nuke, monkeypatch, capsys):
+    monkeypatch.setattr(AdvancedReadNode, "LIGHTNING_RENDER_SCRIPT",
+                        os.path.join(REPO_DIR, "Loaders", "LoadLightningRenderFromRender.py"))
+    read = nuke.nodes.Read()
+    AdvancedReadNode.add_custom_tab(read)
+    with read:
+        exec(read['load_lightning'].value(), {})
+    output = capsys.readouterr().out
+    assert "Starting find_latest_renders_and_setup_crypto function" in output
+    assert "Could not determine sequence and shot numbers." in output
@@ -0,0 +1,61 @@
+import CallbackDispatcher
+import CallbackProfiler
+import CallbackSuspension
+import GuardedKnobs
+import CryptoLabeler
+import CryptoMatteFixer
+
+def tool_handler(tool, calls, write=None):
+    """A knobChanged handler that looks like it belongs to module tool and records its calls."""
+    def handler(node, knob):
+        calls.append((tool, knob.name()))
+        if write:
+            GuardedKnobs.set_value(node, write, 20)
+    handler.__module__ = tool
+    handler.__qualname__ = f"{tool}.on_knob_changed"
+    return handler
+
+def test_guarded_write_is_routed_to_other_handlers_only(nuke):
+    calls = []
+    writer = tool_handler("WriterTool", calls, write='note_font_size')
+    reader = tool_handler("ReaderTool", calls)
+    # Dots are left alone by the toolkit's own handlers
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, writer, node_classes=['Dot'])
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, reader, node_classes=['Dot'])
+    try:
+        node = nuke.nodes.Dot()
+        node['label'].setValue("A")
+    finally:
+        CallbackDispatcher.unregister(CallbackDispatcher.KNOB_CHANGED, writer)
+        CallbackDispatcher.unregister(CallbackDispatcher.KNOB_CHANGED, reader)
+    assert calls == [("WriterTool", "label"), ("ReaderTool", "note_font_size"), ("ReaderTool", "label")]
+    assert node['note_font_size'].value() == 20
+
+def test_cryptomatte_fixer_layer_fix_still_updates_crypto_labeler(nuke):
+    crypto = nuke.nodes.Cryptomatte(cryptoLayer="cryptomatte_obj", expression="", matteList="")
+    crypto['expression'].setValue("(cryptomatte_mat00.red == 1.0)")
+    assert crypto['cryptoLayer'].value() == "cryptomatte_mat"
+    keep_rgba = [node for node in crypto.dependent() if CryptoLabeler.is_our_keep_rgba_node(node)]
+    assert len(keep_rgba) == 1
+
+def test_deferred_refreshes_are_profiled_and_respect_the_time_budget(nuke, monkeypatch):
+    refreshed = []
+    handler = tool_handler("SlowTool", [])
+    CallbackDispatcher.register(CallbackDispatcher.KNOB_CHANGED, handler, node_classes=['Dot'],
+                                refresh=refreshed.append)
+    CallbackProfiler.start()
+    try:
+        node = nuke.nodes.Dot()
+        with CallbackSuspension.suspended():
+            node['label'].setValue("A")
+        assert refreshed == [node]
+        assert CallbackProfiler.report()["handlers"]["SlowTool.SlowTool.on_knob_changed"]["knobs"] == {"<refresh>": 1}
+
+        monkeypatch.setattr(CallbackProfiler, "TIME_BUDGET_SECONDS", 1e-9)
+        node['label'].setValue("B")  # Over budget: disabled from now on
+        with CallbackSuspension.suspended():
+            node['label'].setValue("C")
+        assert refreshed == [node]
+    finally:
+        CallbackProfiler.stop()
+        CallbackDispatcher.unregister(CallbackDispatcher.KNOB_CHANGED, handler)
@@ -0,0 +1,28 @@
+import NodeLabeler
+
+def animated_grade(nuke, name):
+    grade = nuke.nodes.Grade(name=name)
+    grade['white'].setValueAt(1.2, 1001)
+    return grade
+
+def test_knob_change_labels_an_animated_node(nuke):
+    grade = animated_grade(nuke, "Grade1")
+    assert grade['label'].value() == "Animated"
+    grade['white'].clearAnimated()
+    assert grade['label'].value() == ""
+
+def test_renamed_node_does_not_pass_its_state_to_a_node_taking_its_name(nuke):
+    animated = animated_grade(nuke, "Grade1")
+    static = nuke.nodes.Grade(name="Grade2")
+    animated.setName("Renamed")
+    static.setName("Grade1")
+    static['mix'].setValue(0.5)
+    assert static['label'].value() == "Mix: 0.50"
+    animated['mix'].setValue(0.5)
+    assert animated['label'].value() == "Animated\nMix: 0.50"
+
+def test_deleted_node_is_dropped_from_the_cache(nuke):
+    grade = animated_grade(nuke, "Grade1")
+    assert grade in NodeLabeler._animated_knobs
+    nuke.delete(grade)
+    assert grade not in NodeLabeler._animated_knobs
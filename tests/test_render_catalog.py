@@ -0,0 +1,32 @@
+import sqlite3
+
+import RenderCatalog
+
+def test_stored_entries_are_visible_to_another_session_right_away(tmp_path):
+    path = str(tmp_path / "catalog.sqlite")
+    catalog = RenderCatalog.RenderCatalog(path)
+    catalog.store_listing("/out/FILM/SQ0010", 12.0, (["SH0010"], []))
+    catalog.store_frame_runs("/out/FILM/SQ0010/SH0010", r"(\d+)\.exr$", 13.0, [(1001, 1010)])
+    other = RenderCatalog.RenderCatalog(path)
+    assert other.load_listing("/out/FILM/SQ0010", 12.0) == (["SH0010"], [])
+    assert other.load_frame_runs("/out/FILM/SQ0010/SH0010", r"(\d+)\.exr$", 13.0) == [(1001, 1010)]
+    # Writing from this session does not wait on a transaction left open by the first one
+    other.store_listing("/out/FILM/SQ0020", 14.0, ([], []))
+    assert catalog.load_listing("/out/FILM/SQ0020", 14.0) == ([], [])
+
+def test_locked_catalog_is_skipped(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(RenderCatalog, "LOCK_TIMEOUT", 0.05)
+    path = str(tmp_path / "catalog.sqlite")
+    catalog = RenderCatalog.RenderCatalog(path)
+    other_session = sqlite3.connect(path)
+    other_session.execute("BEGIN EXCLUSIVE")
+    try:
+        catalog.store_listing("/out/FILM/SQ0010", 12.0, (["SH0010"], []))
+        catalog.store_frame_runs("/out/FILM/SQ0010/SH0010", r"(\d+)\.exr$", 13.0, [(1001, 1010)])
+        assert catalog.load_listing("/out/FILM/SQ0010", 12.0) is None
+    finally:
+        other_session.rollback()
+        other_session.close()
+    assert capsys.readouterr().out.count("not used") == 1
+    assert catalog.disabled
+    assert RenderCatalog.RenderCatalog(path).load_listing("/out/FILM/SQ0010", 12.0) is None
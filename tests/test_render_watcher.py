@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+import RenderIndex
+import RenderWatcher
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+
+class RefusingLibc(object):
+    """libc whose inotify_add_watch fails like it does once max_user_watches is reached."""
+
+    def __init__(self, libc):
+        self._libc = libc
+
+    def inotify_add_watch(self, fd, path, mask):
+        return -1
+
+    def __getattr__(self, name):
+        return getattr(self._libc, name)
+
+def make_index(tmp_path):
+    shot = tmp_path / "FILM" / "SQ0010" / "SH0010"
+    shot.mkdir(parents=True)
+    index = RenderIndex.RenderIndex(str(tmp_path / "FILM"))
+    index.list_dir(str(shot))
+    return index, shot
+
+def test_directories_inotify_refuses_are_polled(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(RenderWatcher, "POLL_INTERVAL", 0.0)
+    index, shot = make_index(tmp_path)
+    watcher = RenderWatcher.RenderWatcher(index, mode="inotify")
+    watcher.backend._libc = RefusingLibc(watcher.backend._libc)
+    try:
+        watcher.check()
+        watcher.check()
+        assert RenderIndex.normalize_path(str(shot)) in watcher.backend.failed
+        assert capsys.readouterr().out.count("inotify cannot watch") == 1
+
+        (shot / "lighting").mkdir()
+        os.utime(str(shot), (0, 12345))  # Make the mtime change visible on coarse filesystems
+        watcher.check()
+        assert index.list_dir(str(shot))[0] == ["lighting"]
+    finally:
+        watcher.stop()
+
+def test_stop_waits_for_the_thread_before_closing_inotify(tmp_path, capsys):
+    index, shot = make_index(tmp_path)
+    watcher = RenderWatcher.RenderWatcher(index, mode="inotify")
+    watcher.start()
+    thread = watcher._thread
+    watcher.stop()
+    assert not thread.is_alive()
+    assert "RenderWatcher error" not in capsys.readouterr().out
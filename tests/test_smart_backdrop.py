@@ -0,0 +1,24 @@
+import SmartBackdrop
+
+def backdrop(nuke, x, y, width, height, selected=False):
+    return nuke.nodes.BackdropNode(xpos=x, ypos=y, bdwidth=width, bdheight=height, selected=selected)
+
+def test_delete_backdrops_deletes_a_selected_backdrop(nuke):
+    backdrop(nuke, 0, 0, 400, 300, selected=True)
+    SmartBackdrop.delete_backdrops()
+    assert nuke.allNodes() == []
+
+def test_delete_backdrops_deletes_the_backdrops_around_a_selected_node(nuke):
+    backdrop(nuke, 0, 0, 1000, 1000)
+    backdrop(nuke, 100, 100, 400, 300)
+    elsewhere = backdrop(nuke, 2000, 0, 400, 300)
+    grade = nuke.nodes.Grade(xpos=150, ypos=200, selected=True)
+    SmartBackdrop.delete_backdrops()
+    assert nuke.allNodes() == [elsewhere, grade]
+
+def test_delete_backdrops_deletes_a_selected_nested_backdrop_and_its_parents(nuke):
+    backdrop(nuke, 0, 0, 1000, 1000)
+    backdrop(nuke, 100, 100, 400, 300, selected=True)
+    grade = nuke.nodes.Grade(xpos=150, ypos=200)
+    SmartBackdrop.delete_backdrops()
+    assert nuke.allNodes() == [grade]